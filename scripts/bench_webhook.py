@@ -0,0 +1,88 @@
+"""
+Load test for the Feishu webhook endpoint.
+
+Fires concurrent search messages at a running server and reports ack
+latency percentiles against Feishu's 3-second deadline.
+
+Every request is a distinct ``search`` command, so the server runs one real
+search job per request. Never point this at a server holding live
+credentials: it would start real Exa and LLM calls and post replies to the
+``oc_bench`` chat. Run the server as a dry run instead, with the API keys
+blanked (searches, summaries and ideas are then simulated and notifications
+are only logged), from a scratch copy of the project so the simulated papers
+do not end up in the real ``data/`` directory.
+
+Usage:
+    # in another terminal, from a scratch copy of the project
+    EXA_API_KEY= OPENAI_API_KEY= APP_ID= APP_SECRET= FEISHU_WEBHOOK= optoagent-server --production
+    python scripts/bench_webhook.py --requests 200 --concurrency 20
+"""
+
+import argparse
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEADLINE = 3.0
+
+
+def _event(i):
+    return {
+        "header": {"event_type": "im.message.receive_v1", "event_id": f"bench-{uuid.uuid4()}"},
+        "event": {
+            "message": {
+                "content": json.dumps({"text": f"search bench query {i}"}),
+                "message_type": "text",
+                "chat_id": "oc_bench",
+                "message_id": f"om-{uuid.uuid4()}",
+            }
+        },
+    }
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5000/feishu_webhook")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+
+    def post(i):
+        start = time.perf_counter()
+        try:
+            ok = session.post(args.url, json=_event(i), timeout=10).ok
+        except requests.RequestException:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(post, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [lat for lat, _ in results]
+    errors = sum(1 for _, ok in results if not ok)
+    late = sum(1 for lat in latencies if lat > DEADLINE)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s "
+          f"({args.requests / elapsed:.1f} req/s)")
+    for pct in (50, 95, 99):
+        print(f"  p{pct}: {_percentile(latencies, pct) * 1000:.1f} ms")
+    print(f"  max: {max(latencies) * 1000:.1f} ms")
+    print(f"  errors: {errors}, over {DEADLINE:.0f}s deadline: {late}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,23 +12,33 @@ Commands:
     list_ideas       List generated ideas
     add_experiment   Add an experiment record
     index_knowledge  Index local knowledge base for RAG
+    similar          Find stored papers similar to --query
+
+Heavy modules (HTTP clients, LLM SDKs, ChromaDB) are imported inside the
+command that needs them, so storage-only commands start instantly.
 """
 
 import argparse
 
-from optoagent.config import DEFAULT_LIMIT, DEFAULT_QUERY, EXA_API_KEY
+from optoagent.config import DEFAULT_LIMIT
 from optoagent.logger import get_logger
 from optoagent.models import Experiment
-from optoagent.modules.idea_generator import IdeaGenerator
-from optoagent.modules.notifier import FeishuNotifier
-from optoagent.modules.searcher import PaperSearcher
-from optoagent.modules.storage import Storage
-from optoagent.modules.summarizer import PaperSummarizer
-from optoagent.modules.vector_store import VectorStore
 
 logger = get_logger(__name__)
 
 
+def _get_storage():
+    from optoagent.modules.storage import Storage
+
+    return Storage()
+
+
+def _get_service():
+    from optoagent.service import AgentService
+
+    return AgentService()
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="OptoAgent CLI")
     parser.add_argument(
@@ -41,10 +51,11 @@ def main() -> None:
             "active_search",
             "monitor_sources",
             "index_knowledge",
+            "similar",
         ],
         help="Command to execute",
     )
-    parser.add_argument("--query", help="Search query for active search or run_cycle")
+    parser.add_argument("--query", help="Search query for active_search, run_cycle or similar")
     parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Number of papers to find")
     parser.add_argument("--title", help="Title for 'add_experiment'")
     parser.add_argument("--desc", help="Description for 'add_experiment'")
@@ -53,13 +64,6 @@ def main() -> None:
 
     args = parser.parse_args()
 
-    # Initialize services
-    storage = Storage()
-    vector_store = VectorStore()
-    notifier = FeishuNotifier()
-    searcher = PaperSearcher(exa_api_key=EXA_API_KEY)
-    summarizer = PaperSummarizer()
-
     # ---- Command dispatch ----
 
     if args.command == "add_experiment":
@@ -72,72 +76,42 @@ def main() -> None:
             results=args.results or "Pending",
             status="ongoing",
         )
-        storage.add_experiment(exp)
+        _get_storage().add_experiment(exp)
         logger.info("Experiment added successfully.")
 
     elif args.command == "list_papers":
-        for p in storage.get_papers():
+        for p in _get_storage().get_papers():
             print(f"- {p.title} ({p.url})")
 
     elif args.command == "list_ideas":
-        for i in storage.get_ideas():
+        for i in _get_storage().get_ideas():
             print(f"- {i.title}\n  Reasoning: {i.reasoning[:100]}...")
 
     elif args.command == "index_knowledge":
+        from optoagent.modules.vector_store import VectorStore
+
         logger.info("Indexing knowledge base from 'data/knowledge'...")
-        vector_store.index_documents()
-
-    elif args.command in ("run_cycle", "active_search", "monitor_sources"):
-        papers = []
-
-        if args.command == "monitor_sources":
-            logger.info("Monitoring tracked sources (Journals & Groups)...")
-            papers = searcher.monitor_sources()
-            if not papers:
-                logger.info("No new papers found from tracked sources.")
-
-        elif args.command in ("active_search", "run_cycle"):
-            query = args.query or DEFAULT_QUERY
-            papers = searcher.search_active(query, limit=args.limit)
-
-        # Process papers: Summarize → Store → Notify
-        new_papers = []
-        for p in papers:
-            existing = [ep for ep in storage.get_papers() if ep.title == p.title]
-            if not existing:
-                logger.info("Summarizing new paper: %s", p.title)
-                p.summary = summarizer.summarize(p)
-                storage.add_paper(p)
-                new_papers.append(p)
-                notifier.notify_new_paper(p, receive_id=args.chat_id)
-            else:
-                logger.info("Paper already exists: %s", p.title)
-
-        if not new_papers:
-            logger.info("No new papers found during this cycle.")
-
-        # Generate ideas for run_cycle or monitor_sources with new papers
-        if args.command == "run_cycle" or (args.command == "monitor_sources" and new_papers):
-            all_papers = storage.get_papers()
-            experiments = storage.get_experiments()
-
-            if new_papers or all_papers:
-                # RAG: retrieve relevant context
-                context = ""
-                if new_papers:
-                    query_text = f"{new_papers[0].title} {new_papers[0].summary}"
-                    logger.info("Retrieving context for: %s...", new_papers[0].title)
-                    context = vector_store.query_similar_context(query_text)
-
-                generator = IdeaGenerator()
-                recent_papers = new_papers if new_papers else all_papers[-5:]
-                idea = generator.generate_idea(recent_papers, experiments, context)
-
-                storage.add_idea(idea)
-                notifier.notify_new_idea(idea, receive_id=args.chat_id)
-                logger.info("Generated new idea: %s", idea.title)
-            else:
-                logger.info("Not enough papers to generate ideas.")
+        VectorStore().index_documents()
+
+    elif args.command == "similar":
+        if not args.query:
+            logger.error("--query is required for similar")
+            return
+        from optoagent.modules.vector_store import VectorStore
+
+        store = VectorStore()
+        store.index_papers(_get_storage())
+        for hit in store.related_papers(args.query, n_results=args.limit):
+            print(f"- [{hit['distance']:.3f}] {hit['title']} ({hit['url']})")
+
+    elif args.command == "monitor_sources":
+        _get_service().monitor_sources(chat_id=args.chat_id)
+
+    elif args.command == "active_search":
+        _get_service().active_search(args.query, limit=args.limit, chat_id=args.chat_id)
+
+    elif args.command == "run_cycle":
+        _get_service().run_cycle(args.query, limit=args.limit, chat_id=args.chat_id)
 
 
 if __name__ == "__main__":
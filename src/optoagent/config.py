@@ -65,6 +65,14 @@ FEISHU_WEBHOOK: str | None = os.getenv("FEISHU_WEBHOOK")
 APP_ID: str | None = os.getenv("APP_ID")
 APP_SECRET: str | None = os.getenv("APP_SECRET")
 
+# ---------------------------------------------------------------------------
+# LLM settings
+# ---------------------------------------------------------------------------
+
+_llm_cfg = _cfg.get("llm", {})
+LLM_MAX_CONCURRENCY: int = _llm_cfg.get("max_concurrency", 4)
+LLM_CACHE_MAX_ENTRIES: int = _llm_cfg.get("cache_max_entries", 5000)
+
 # ---------------------------------------------------------------------------
 # Search settings
 # ---------------------------------------------------------------------------
@@ -77,6 +85,50 @@ DEFAULT_QUERY: str = _search_cfg.get(
 DEFAULT_LIMIT: int = _search_cfg.get("default_limit", 5)
 SEARCH_DAYS_BACK: int = _search_cfg.get("days_back", 30)
 ACADEMIC_DOMAINS: list[str] = _search_cfg.get("academic_domains", [])
+EXA_MAX_CONCURRENCY: int = _search_cfg.get("exa_max_concurrency", 4)
+EXA_RATE_LIMIT: float = _search_cfg.get("exa_rate_limit", 2)  # requests per second
+
+# ---------------------------------------------------------------------------
+# Outbound rate limiting (per upstream host)
+# ---------------------------------------------------------------------------
+
+_rate_cfg = _cfg.get("rate_limits", {})
+RATE_LIMIT_MAX_RETRIES: int = _rate_cfg.get("max_retries", 4)
+RATE_LIMIT_BACKOFF_BASE: float = _rate_cfg.get("backoff_base", 1.0)
+RATE_LIMIT_BACKOFF_MAX: float = _rate_cfg.get("backoff_max", 60.0)
+RATE_LIMIT_HOSTS: dict = _rate_cfg.get("hosts", {})
+
+# ---------------------------------------------------------------------------
+# Metadata enrichment settings
+# ---------------------------------------------------------------------------
+
+_metadata_cfg = _cfg.get("metadata", {})
+METADATA_CACHE_TTL: float = _metadata_cfg.get("cache_ttl_days", 30) * 86400
+METADATA_NEGATIVE_TTL: float = _metadata_cfg.get("negative_ttl_hours", 24) * 3600
+METADATA_CROSSREF_CONCURRENCY: int = _metadata_cfg.get("crossref_concurrency", 4)
+METADATA_S2_CONCURRENCY: int = _metadata_cfg.get("s2_concurrency", 2)
+
+# ---------------------------------------------------------------------------
+# Paper dedup settings
+# ---------------------------------------------------------------------------
+
+_dedup_cfg = _cfg.get("dedup", {})
+DEDUP_NEAR_THRESHOLD: float = _dedup_cfg.get("near_duplicate_threshold", 0.7)
+
+# ---------------------------------------------------------------------------
+# Knowledge base (RAG) settings
+# ---------------------------------------------------------------------------
+
+_rag_cfg = _cfg.get("rag", {})
+RAG_EXTRACT_WORKERS: int = _rag_cfg.get("extract_workers", 0)
+RAG_PDF_TIMEOUT: float = _rag_cfg.get("pdf_timeout", 120)
+RAG_BATCH_SIZE: int = _rag_cfg.get("batch_size", 64)
+RAG_CHECKPOINT_EVERY: int = _rag_cfg.get("checkpoint_every", 10)
+RAG_CHUNK_SIZE: int = _rag_cfg.get("chunk_size", 1000)
+RAG_CHUNK_OVERLAP: int = _rag_cfg.get("chunk_overlap", 150)
+RAG_BACKEND: str = _rag_cfg.get("backend", "chroma")
+RAG_EMBEDDING_CACHE: bool = _rag_cfg.get("embedding_cache", True)
+RAG_RELATED_PAPERS: int = _rag_cfg.get("related_papers", 3)
 
 # ---------------------------------------------------------------------------
 # Scheduler settings
@@ -85,6 +137,22 @@ ACADEMIC_DOMAINS: list[str] = _search_cfg.get("academic_domains", [])
 _sched_cfg = _cfg.get("scheduler", {})
 SCHEDULER_INTERVAL: int = _sched_cfg.get("interval", 6)
 SCHEDULER_UNIT: str = _sched_cfg.get("unit", "hours")
+SCHEDULER_JOB_TIMEOUT: float = _sched_cfg.get("job_timeout", 1800)
+
+# ---------------------------------------------------------------------------
+# Webhook server settings
+# ---------------------------------------------------------------------------
+
+_server_cfg = _cfg.get("server", {})
+SERVER_HOST: str = _server_cfg.get("host", "0.0.0.0")
+SERVER_PORT: int = _server_cfg.get("port", 5000)
+SERVER_JOB_WORKERS: int = _server_cfg.get("job_workers", 2)
+SERVER_MAX_PENDING: int = _server_cfg.get("max_pending_jobs", 10)
+SERVER_DEDUP_TTL: float = _server_cfg.get("dedup_ttl", 3600)
+SERVER_PRODUCTION: bool = _server_cfg.get("production", False)
+SERVER_THREADS: int = _server_cfg.get("threads", 8)
+SERVER_CONNECTION_LIMIT: int = _server_cfg.get("connection_limit", 100)
+SERVER_CHANNEL_TIMEOUT: int = _server_cfg.get("channel_timeout", 30)
 
 # ---------------------------------------------------------------------------
 # Tracking sources
@@ -93,6 +161,9 @@ SCHEDULER_UNIT: str = _sched_cfg.get("unit", "hours")
 _tracking_cfg = _cfg.get("tracking", {})
 RSS_FEEDS: list[str] = _tracking_cfg.get("rss_feeds", [])
 RESEARCH_GROUPS: list[dict] = _tracking_cfg.get("research_groups", [])
+RSS_MAX_WORKERS: int = _tracking_cfg.get("rss_max_workers", 16)
+RSS_PER_HOST: int = _tracking_cfg.get("rss_per_host", 4)
+RSS_TIMEOUT: float = _tracking_cfg.get("rss_timeout", 15)
 
 # ---------------------------------------------------------------------------
 # Target journals
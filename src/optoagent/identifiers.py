@@ -0,0 +1,78 @@
+"""
+Paper identifier helpers shared by storage, dedup and metadata lookup.
+
+Kept free of heavy imports so that the storage layer can canonicalize
+titles, DOIs and URLs without pulling in the HTTP stack.
+"""
+
+import re
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+# Query parameters that never change which document a URL points to
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def strip_group_prefix(title: str) -> str:
+    """Remove the ``[Group Name]`` prefix added by research-group tracking."""
+    return re.sub(r'^\[.*?\]\s*', '', title or '').strip()
+
+
+def normalize_title(title: str) -> str:
+    """Case-fold a title and collapse whitespace for equality lookups."""
+    return " ".join((title or "").casefold().split())
+
+
+def title_fingerprint(title: str) -> str:
+    """Dedup key for a title: group prefix, case, punctuation and extra spaces removed."""
+    return normalize_title(re.sub(r'[^\w\s]', ' ', strip_group_prefix(title)))
+
+
+def extract_doi(url: str) -> str | None:
+    """Extract DOI from common academic publisher URLs."""
+    if not url:
+        return None
+
+    url = unquote(url)
+
+    # Pattern 1: /doi/10.xxxx/... (science.org, wiley, etc.)
+    m = re.search(r'/doi/?(10\.\d{4,}/[^\s?#]+)', url)
+    if m:
+        return m.group(1).rstrip('/')
+
+    # Pattern 2: nature.com/articles/s41xxx-xxx-xxxxx-x
+    m = re.search(r'nature\.com/articles/(s\d+[-\w]+)', url)
+    if m:
+        article_id = m.group(1)
+        # Nature DOIs follow pattern 10.1038/{article_id}
+        return f"10.1038/{article_id}"
+
+    # Pattern 3: pubs.acs.org/doi/10.xxxx/...
+    m = re.search(r'(10\.\d{4,}/[^\s?#]+)', url)
+    if m:
+        return m.group(1).rstrip('/')
+
+    return None
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduce a URL to a scheme-less, fragment-less key.
+
+    ``https://www.nature.com/articles/x?utm_source=rss`` and
+    ``http://nature.com/articles/x/`` map to the same key.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ]
+    key = f"{host}{path}"
+    if query:
+        key += "?" + urlencode(sorted(query))
+    return key
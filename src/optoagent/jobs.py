@@ -0,0 +1,151 @@
+"""
+Bounded in-process job queue for webhook-triggered searches.
+
+A fixed pool of worker threads drains a bounded FIFO of search jobs.
+Identical queries for the same chat that are already queued or running are
+coalesced into the existing job, redelivered events are dropped by their
+delivery ID, and submissions beyond the queue limit are rejected instead of
+piling up threads.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Iterable, Optional, Tuple
+
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Submission outcomes
+STARTED = "started"
+QUEUED = "queued"
+COALESCED = "coalesced"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+
+
+@dataclass
+class Submission:
+    status: str
+    position: int = 0  # 1-based queue position (QUEUED) or queue length (REJECTED)
+
+
+@dataclass
+class _Job:
+    query: str
+    chat_id: Optional[str]
+    key: Tuple[str, Optional[str]]
+
+
+class JobQueue:
+    """Fixed worker pool over a bounded queue with coalescing and delivery dedup."""
+
+    def __init__(
+        self,
+        handler: Callable[[str, Optional[str]], object],
+        workers: int = 2,
+        max_pending: int = 10,
+        dedup_ttl: float = 3600,
+        dedup_size: int = 4096,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.dedup_ttl = dedup_ttl
+        self.dedup_size = dedup_size
+
+        self._cond = threading.Condition()
+        self._pending: Deque[_Job] = deque()
+        self._active_keys: set = set()
+        self._running = 0
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._threads: list = []
+
+    # ---- Public API ----
+
+    def submit(
+        self,
+        query: str,
+        chat_id: str | None = None,
+        delivery_ids: Iterable[Optional[str]] = (),
+    ) -> Submission:
+        """Queue a search job unless it is a redelivery, already in flight, or the queue is full."""
+        key = (" ".join(query.casefold().split()), chat_id)
+        with self._cond:
+            if self._check_delivered([d for d in delivery_ids if d]):
+                return Submission(DUPLICATE)
+            if key in self._active_keys:
+                return Submission(COALESCED)
+            if self._waiting() >= self.max_pending:
+                return Submission(REJECTED, position=self._waiting())
+
+            self._ensure_workers()
+            self._pending.append(_Job(query, chat_id, key))
+            self._active_keys.add(key)
+            self._cond.notify_all()
+
+            position = self._waiting()
+            if position == 0:
+                return Submission(STARTED)
+            return Submission(QUEUED, position=position)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"running": self._running, "pending": len(self._pending)}
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until no job is queued or running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # ---- Internal methods ----
+
+    def _waiting(self) -> int:
+        """Jobs that no free worker will pick up right away."""
+        return max(0, len(self._pending) - (self.workers - self._running))
+
+    def _check_delivered(self, delivery_ids: list) -> bool:
+        """Return True if any ID was seen within the TTL; otherwise remember them all."""
+        now = time.monotonic()
+        while self._seen and next(iter(self._seen.values())) < now - self.dedup_ttl:
+            self._seen.popitem(last=False)
+
+        if any(d in self._seen for d in delivery_ids):
+            return True
+        for d in delivery_ids:
+            self._seen[d] = now
+        while len(self._seen) > self.dedup_size:
+            self._seen.popitem(last=False)
+        return False
+
+    def _ensure_workers(self) -> None:
+        # Started on first submit so importing the server spawns no threads
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._worker, name=f"job-{len(self._threads)}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job = self._pending.popleft()
+                self._running += 1
+            try:
+                self.handler(job.query, job.chat_id)
+            except Exception:
+                logger.exception("Job failed for '%s'", job.query)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._active_keys.discard(job.key)
+                    self._cond.notify_all()
@@ -0,0 +1,107 @@
+"""
+Structure-aware text chunking for the RAG index.
+
+Text is split at Markdown headings, then paragraphs, then sentences, and
+the pieces are packed into chunks of at most ``chunk_size`` characters.
+Small neighbouring sections share a chunk. When a section has to be split,
+each chunk after the first repeats the last ``overlap`` characters of the
+previous one, so a passage that straddles a boundary is still retrievable.
+"""
+
+import hashlib
+import re
+from typing import List
+
+_HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[。！？；])")
+
+
+def chunk_id(relpath: str, chunk: str) -> str:
+    """Stable chunk ID: relative path plus a hash of the chunk text."""
+    return f"{relpath}#{hashlib.sha1(chunk.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _split_sections(text: str) -> List[str]:
+    starts = [m.start() for m in _HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    sections = (text[a:b].strip() for a, b in zip(bounds, bounds[1:]))
+    return [s for s in sections if s]
+
+
+def _hard_split(text: str, limit: int) -> List[str]:
+    """Cut text into pieces of at most ``limit`` characters, preferring whitespace."""
+    limit = max(1, limit)  # a zero limit would never shrink the text
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind(" ", limit // 2, limit)
+        if cut <= 0:
+            cut = limit
+        pieces.append(text[:cut].strip())
+        text = text[cut:].strip()
+    if text:
+        pieces.append(text)
+    return pieces
+
+
+def _split_units(section: str, limit: int) -> List[tuple]:
+    """Break a section into (text, separator) units no longer than ``limit``."""
+    units = []
+    for paragraph in _PARAGRAPH_BREAK.split(section):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= limit:
+            units.append((paragraph, "\n\n"))
+            continue
+        sep = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            for piece in _hard_split(sentence, limit):
+                units.append((piece, sep))
+                sep = " "
+    return units
+
+
+def _tail(text: str, size: int) -> str:
+    """The last ``size`` characters of text, starting at a word boundary when possible."""
+    if size <= 0:
+        return ""
+    tail = text[-size:]
+    space = tail.find(" ")
+    if 0 <= space < len(tail) - 1 and len(text) > size:
+        tail = tail[space + 1:]
+    return tail
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 150) -> List[str]:
+    """Split text into structure-respecting chunks of at most ``chunk_size`` characters."""
+    overlap = max(0, min(overlap, chunk_size // 2))
+    chunks: List[str] = []
+    current = ""
+
+    for section in _split_sections(text):
+        if current and len(current) + 2 + len(section) <= chunk_size:
+            current += "\n\n" + section
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        if len(section) <= chunk_size:
+            current = section
+            continue
+
+        for unit, sep in _split_units(section, max(1, chunk_size - overlap - 1)):
+            if current and len(current) + len(sep) + len(unit) > chunk_size:
+                chunks.append(current)
+                current = _tail(current, overlap)
+                sep = " " if current else ""
+            current = current + sep + unit if current else unit
+
+    if current:
+        chunks.append(current)
+    return chunks
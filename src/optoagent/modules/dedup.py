@@ -0,0 +1,99 @@
+"""
+Near-duplicate detection for incoming papers.
+
+Exact keys (canonical DOI, URL and title) miss the same article arriving as
+a preprint, as an RSS entry with a reworded title, or with a trimmed
+abstract. Each paper's title plus abstract is reduced to a 128-value
+MinHash signature, and locality-sensitive hashing over bands of the
+signature finds candidates in constant time. A candidate counts as a
+duplicate when the estimated Jaccard similarity of the two texts' word
+shingles reaches the threshold.
+"""
+
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from optoagent.identifiers import strip_group_prefix
+
+NUM_PERM = 128
+BANDS = 32  # 4 rows per band: candidates from roughly 0.4 similarity up
+_PRIME = (1 << 31) - 1
+
+_rng = np.random.RandomState(20240229)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+def _shingles(text: str) -> Set[int]:
+    """Hashes of the word bigrams (or the lone word) of a normalized text."""
+    words = re.findall(r"\w+", text.casefold())
+    if len(words) < 2:
+        grams = words
+    else:
+        grams = [f"{a} {b}" for a, b in zip(words, words[1:])]
+    return {zlib.crc32(g.encode("utf-8")) for g in grams}
+
+
+def paper_text(title: str, abstract: str | None) -> str:
+    """The text a paper is fingerprinted on: title without group prefix, plus abstract."""
+    return f"{strip_group_prefix(title)} {abstract or ''}"
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of ``text`` (None if it has no words)."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    x = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    return ((np.outer(_A, x) + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class NearDuplicateIndex:
+    """In-memory MinHash LSH index mapping signatures to paper keys."""
+
+    def __init__(self, threshold: float = 0.7):
+        self.threshold = threshold
+        self._rows = NUM_PERM // BANDS
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(BANDS)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        r = self._rows
+        return [(i, signature[i * r:(i + 1) * r].tobytes()) for i in range(BANDS)]
+
+    def add(self, key: int, signature: Optional[np.ndarray]) -> None:
+        if signature is None:
+            return
+        with self._lock:
+            self._signatures[key] = signature
+            for band, value in self._bands(signature):
+                self._buckets[band][value].append(key)
+
+    def find(self, signature: Optional[np.ndarray]) -> Optional[Tuple[int, float]]:
+        """Best match at or above the threshold as (key, similarity), else None."""
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for band, value in self._bands(signature):
+                candidates.update(self._buckets[band].get(value, ()))
+            best = None
+            for key in candidates:
+                score = similarity(signature, self._signatures[key])
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (key, score)
+            return best
@@ -0,0 +1,126 @@
+"""
+Text extraction for knowledge-base documents.
+
+Markdown and text files are read inline; PDFs are parsed on a process pool
+so extraction scales with the available cores. Results are yielded as each
+file finishes, and every PDF gets a time limit so a malformed file cannot
+stall the run.
+
+This module is imported by the pool's worker processes, so it must stay
+free of heavy imports (no ChromaDB, no HTTP clients).
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterable, Iterator, Optional, Tuple
+
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_text_file(filepath: str) -> str:
+    """Read a text file, trying multiple encodings."""
+    for enc in ("utf-8", "utf-8-sig", "utf-16", "gbk", "latin-1"):
+        try:
+            with open(filepath, "r", encoding=enc) as f:
+                return f.read()
+        except (UnicodeDecodeError, UnicodeError):
+            continue
+    logger.warning("Could not decode file %s with any encoding, skipping.", filepath)
+    return ""
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("PDF extraction timed out")
+
+
+def extract_pdf_text(filepath: str, timeout: float | None = None) -> str:
+    """
+    Extract the text of every page of a PDF.
+
+    Raises TimeoutError once ``timeout`` seconds have passed. On POSIX an
+    interval timer interrupts even a single stuck page; elsewhere the limit
+    is checked between pages.
+    """
+    from pypdf import PdfReader
+
+    deadline = time.monotonic() + timeout if timeout else None
+    use_alarm = (
+        bool(timeout)
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        reader = PdfReader(filepath)
+        pages = []
+        for page in reader.pages:
+            pages.append(page.extract_text() or "")
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("PDF extraction timed out")
+        return "\n".join(pages)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def iter_documents(
+    paths: Iterable[str],
+    max_workers: int | None = None,
+    timeout: float | None = None,
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield ``(path, text)`` for each file as soon as it has been read.
+
+    ``text`` is None when a PDF failed to parse or timed out. Order follows
+    completion, not input.
+    """
+    paths = list(paths)
+    pdfs = [p for p in paths if p.lower().endswith(".pdf")]
+    others = [p for p in paths if not p.lower().endswith(".pdf")]
+
+    if not pdfs:
+        for path in others:
+            yield path, read_text_file(path)
+        return
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(pdfs)))
+    # spawn, not fork: the parent may already hold ChromaDB and HTTP threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        queue = iter(pdfs)
+        inflight = {}
+
+        def _fill() -> None:
+            # Keep a small window in flight so results stream instead of piling up
+            while len(inflight) < workers * 2:
+                path = next(queue, None)
+                if path is None:
+                    return
+                inflight[pool.submit(extract_pdf_text, path, timeout)] = path
+
+        _fill()
+
+        # Text files are read while the workers start up
+        for path in others:
+            yield path, read_text_file(path)
+
+        while inflight:
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = inflight.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.warning("Failed to read PDF %s: %s", os.path.basename(path), e)
+                    text = None
+                yield path, text
+            _fill()
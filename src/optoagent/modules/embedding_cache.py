@@ -0,0 +1,185 @@
+"""
+Persistent cache of text embeddings.
+
+Vectors are appended to a float32 file that is read back through
+``numpy.memmap``; a SQLite table maps each key to its row. Keys hash the
+embedding model name together with the text, so an identical text is
+embedded only once per model, whether it is a chunk being indexed or a
+query being searched.
+
+The scheduler, the web server and the CLI may share one cache directory.
+Appends run inside a SQLite write transaction, which serialises writers
+across processes, and take their row numbers from the vectors file at that
+point, so no process ever relies on a stale view of the file.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from optoagent.config import DATA_DIR
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    row INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Stay well below SQLite's bound-parameter limit in IN (...) lookups
+_QUERY_BATCH = 500
+
+
+class EmbeddingCache:
+    """Append-only memory-mapped matrix of embeddings keyed by text hash."""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or os.path.join(DATA_DIR, "embedding_cache")
+        self._vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._db_path = os.path.join(self.directory, "index.db")
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    # ---- Persistence ----
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _lookup(self, conn: sqlite3.Connection, keys: Sequence[str]) -> Dict[str, int]:
+        rows: Dict[str, int] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[start:start + _QUERY_BATCH]
+            rows.update(conn.execute(
+                f"SELECT key, row FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall())
+        return rows
+
+    def _dimension(self, conn: sqlite3.Connection) -> Optional[int]:
+        if self._dim is None:
+            found = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+            self._dim = found[0] if found else None
+        return self._dim
+
+    def _get_matrix(self, needed: int) -> np.ndarray:
+        # Other processes append behind our back; remap once we need a row past the old end
+        if self._matrix is None or len(self._matrix) < needed:
+            stored = os.path.getsize(self._vectors_path) // (self._dim * 4)
+            self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(stored, self._dim))
+        return self._matrix
+
+    # ---- Public API ----
+
+    def get(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for ``keys`` (None where missing)."""
+        with self._lock:
+            conn = self._connect()
+            rows = self._lookup(conn, keys)
+            if rows:
+                self._dimension(conn)
+                matrix = self._get_matrix(max(rows.values()) + 1)
+            found = []
+            for key in keys:
+                row = rows.get(key)
+                found.append(None if row is None else np.array(matrix[row]))
+            hits = sum(v is not None for v in found)
+            self.hits += hits
+            self.misses += len(found) - hits
+            return found
+
+    def put(self, keys: Sequence[str], vectors: Sequence) -> None:
+        with self._lock:
+            conn = self._connect()
+            # Takes the database write lock: concurrent writers in other processes wait here
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                known = self._lookup(conn, keys)
+                new: Dict[str, np.ndarray] = {}
+                for k, v in zip(keys, vectors):
+                    if k not in known:
+                        new.setdefault(k, np.asarray(v, dtype=np.float32))
+                if not new:
+                    conn.rollback()
+                    return
+
+                if self._dimension(conn) is None:
+                    self._dim = int(next(iter(new.values())).shape[-1])
+                    conn.execute("INSERT INTO meta (name, value) VALUES ('dim', ?)", (self._dim,))
+                row_bytes = self._dim * 4
+                count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+                size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+
+                if size < count * row_bytes:
+                    logger.warning("Embedding cache vectors file is shorter than its index, starting over.")
+                    conn.execute("DELETE FROM embeddings")
+                    count = 0
+                if size != count * row_bytes:
+                    # Vectors from a write that crashed before its keys were committed
+                    logger.warning("Embedding cache was interrupted mid-write, truncating to %d rows.", count)
+                    with open(self._vectors_path, "r+b") as f:
+                        f.truncate(count * row_bytes)
+
+                with open(self._vectors_path, "ab") as f:
+                    f.write(np.stack(list(new.values())).astype(np.float32).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                conn.executemany(
+                    "INSERT INTO embeddings (key, row) VALUES (?, ?)",
+                    [(k, count + i) for i, k in enumerate(new)],
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._matrix = None
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], Sequence],
+        model: str,
+    ) -> List[np.ndarray]:
+        """Embed ``texts``, calling ``compute`` once for the distinct texts not yet cached."""
+        keys = [self.make_key(model, t) for t in texts]
+        vectors = self.get(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text, vec in zip(keys, texts, vectors):
+            if vec is None:
+                missing.setdefault(key, text)
+        if missing:
+            computed = compute(list(missing.values()))
+            self.put(list(missing), computed)
+            fresh = dict(zip(missing, (np.asarray(v, dtype=np.float32) for v in computed)))
+            vectors = [fresh[k] if v is None else v for k, v in zip(keys, vectors)]
+        return vectors
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {"entries": entries, "hits": self.hits, "misses": self.misses}
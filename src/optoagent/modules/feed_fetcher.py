@@ -0,0 +1,185 @@
+"""
+Concurrent RSS feed fetching.
+
+Downloads feeds on a bounded thread pool with per-request timeouts and a
+per-host connection cap, then parses them with feedparser. Results come
+back in the same order as the input URLs.
+
+A persistent feed-state file under DATA_DIR remembers each feed's ETag,
+Last-Modified and recently seen entry IDs, so unchanged feeds cost a 304
+and only entries not seen on a previous run are returned. State from a
+fetch is only staged: callers ``commit_state()`` once the returned entries
+have been stored, so a run that dies before then sees them again.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from optoagent.config import DATA_DIR, RSS_MAX_WORKERS, RSS_PER_HOST, RSS_TIMEOUT
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How many entry IDs to remember per feed (RSS feeds rarely carry more than ~100)
+_MAX_SEEN_IDS = 500
+
+
+class FeedStateCache:
+    """JSON-backed store of per-feed ETag, Last-Modified and seen entry IDs."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(DATA_DIR, "feed_state.json")
+        self._lock = threading.Lock()
+        self._state: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        if self._state is None:
+            self._state = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._state = json.load(f)
+                except (json.JSONDecodeError, OSError):
+                    logger.warning("Failed to parse %s, starting with empty feed state.", self.path)
+        return self._state
+
+    def get(self, url: str) -> dict:
+        with self._lock:
+            return dict(self._load().get(url, {}))
+
+    def update(self, url: str, etag: str | None, last_modified: str | None, entry_ids: List[str]) -> None:
+        """Record validators and merge newly seen entry IDs (newest first)."""
+        with self._lock:
+            state = self._load()
+            previous = state.get(url, {})
+            current = set(entry_ids)
+            seen = list(entry_ids) + [i for i in previous.get("seen_ids", []) if i not in current]
+            state[url] = {
+                "etag": etag or previous.get("etag"),
+                "last_modified": last_modified or previous.get("last_modified"),
+                "seen_ids": seen[:_MAX_SEEN_IDS],
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            if self._state is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._state, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class FeedFetcher:
+    """Fetches many RSS feeds concurrently without letting one slow host stall the rest."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+        state: Optional[FeedStateCache] = None,
+    ):
+        self.max_workers = max_workers or RSS_MAX_WORKERS
+        self.per_host = per_host or RSS_PER_HOST
+        self.timeout = timeout or RSS_TIMEOUT
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "OptoAgent/1.0 (mailto:optoagent@example.com)"
+        self._session = session
+        self.state = state or FeedStateCache()
+
+        # url -> (etag, last_modified, entry_ids) fetched but not yet committed
+        self._pending: Dict[str, Tuple[Optional[str], Optional[str], List[str]]] = {}
+        self._pending_lock = threading.Lock()
+
+        self._host_lock = threading.Lock()
+        self._host_slots = defaultdict(lambda: threading.BoundedSemaphore(self.per_host))
+
+    def fetch_all(self, urls: List[str]) -> List[Tuple[str, Optional[List[Any]]]]:
+        """
+        Fetch every feed concurrently and return its unseen entries.
+
+        Returns ``(url, entries)`` pairs in input order. ``entries`` holds only
+        entries not seen on a previous run (empty on a 304) and is None when
+        the download or parse failed. The new validators and seen IDs are
+        staged, not saved: call ``commit_state`` after the entries are stored.
+        """
+        if not urls:
+            return []
+        workers = min(self.max_workers, len(urls))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss") as pool:
+            results = list(pool.map(self._fetch_safe, urls))
+        return list(zip(urls, results))
+
+    def commit_state(self) -> None:
+        """Record the staged feed state (validators and seen IDs) and save it to disk."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        for url, (etag, last_modified, entry_ids) in pending.items():
+            self.state.update(url, etag=etag, last_modified=last_modified, entry_ids=entry_ids)
+        self.state.save()
+
+    def discard_state(self) -> None:
+        """Drop the staged feed state, so the next fetch returns the same entries again."""
+        with self._pending_lock:
+            self._pending = {}
+
+    # ---- Internal methods ----
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            return self._host_slots[host]
+
+    def _fetch_safe(self, url: str) -> Optional[List[Any]]:
+        try:
+            return self._fetch(url)
+        except Exception as e:
+            logger.error("Failed to fetch RSS %s: %s", url, e)
+            return None
+
+    @staticmethod
+    def _entry_id(entry: Any) -> str:
+        return entry.get("id") or entry.get("link") or entry.get("title", "")
+
+    def _fetch(self, url: str) -> List[Any]:
+        cached = self.state.get(url)
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        with self._host_slot(url):
+            resp = self._session.get(url, timeout=self.timeout, headers=headers)
+        if resp.status_code == 304:
+            logger.debug("  RSS not modified: %s", url)
+            return []
+        resp.raise_for_status()
+
+        feed = feedparser.parse(resp.content)
+        seen = set(cached.get("seen_ids", []))
+        entry_ids = [self._entry_id(e) for e in feed.entries]
+        fresh = [e for e, eid in zip(feed.entries, entry_ids) if eid not in seen]
+
+        with self._pending_lock:
+            self._pending[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), entry_ids)
+        return fresh
@@ -17,6 +17,13 @@ except ImportError:
 
 
 class IdeaGenerator:
+    """
+    Proposes one research idea from recent papers, experiments and notes.
+
+    Unlike summaries, ideas are not cached: an unchanged prompt (a scheduled
+    run with no new papers) should still yield a fresh idea, not a repeat.
+    """
+
     def __init__(self):
         self.api_key = OPENAI_API_KEY
         self.model = OPENAI_MODEL
@@ -32,11 +39,17 @@ class IdeaGenerator:
         papers: List[Paper],
         experiments: List[Experiment],
         context: str = "",
+        related_papers: Optional[List[Paper]] = None,
     ) -> Idea:
-        """Generate a research idea using CoT reasoning."""
+        """
+        Generate a research idea using CoT reasoning.
+
+        ``related_papers`` are older papers from the library that are similar
+        to ``papers``; they are shown to the LLM as background.
+        """
         logger.info("Generating idea using Chain of Thought...")
         if self.client:
-            return self._generate_with_llm(papers, experiments, context)
+            return self._generate_with_llm(papers, experiments, context, related_papers)
         return self._generate_simulated(papers, experiments)
 
     def _generate_with_llm(
@@ -44,10 +57,16 @@ class IdeaGenerator:
         papers: List[Paper],
         experiments: List[Experiment],
         context: str = "",
+        related_papers: Optional[List[Paper]] = None,
     ) -> Idea:
         papers_text = "\n".join(
             [f"- {p.title}: {p.summary or p.abstract[:200]}" for p in papers]
         )
+        related_text = ""
+        if related_papers:
+            related_text = "\n## Related Papers From Our Library:\n" + "\n".join(
+                [f"- {p.title}: {p.summary or p.abstract[:200]}" for p in related_papers]
+            ) + "\n"
         experiments_text = (
             "\n".join(
                 [
@@ -68,7 +87,7 @@ Based on the following recent papers, internal experiments, and knowledge base n
 
 ## Recent Papers:
 {papers_text}
-
+{related_text}
 ## Internal Experiments:
 {experiments_text}
 {context_text}
@@ -0,0 +1,96 @@
+"""
+Manifest of knowledge-base files already indexed into the vector store.
+
+Records each file's size, mtime, content hash and the chunk IDs it produced,
+so re-indexing can skip unchanged files with a single ``stat`` and remove
+the chunks of files that were edited or deleted. The manifest also stores
+the signature of the index it describes (chunk ID format, chunking settings,
+embedding model); when that no longer matches, the index is rebuilt.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IndexManifest:
+    """JSON-backed map of relative path -> {size, mtime_ns, sha256, chunks}."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._files: Optional[Dict[str, dict]] = None
+        self._signature: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        if self._files is None:
+            self._files = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    self._files = data.get("files", {})
+                    self._signature = data.get("signature")
+                except (json.JSONDecodeError, OSError, AttributeError):
+                    logger.warning("Failed to parse %s, re-indexing from scratch.", self.path)
+        return self._files
+
+    @property
+    def signature(self) -> Optional[Dict[str, Any]]:
+        """Signature of the index this manifest describes (None for old manifests)."""
+        with self._lock:
+            self._load()
+            return self._signature
+
+    def reset(self, signature: Dict[str, Any]) -> None:
+        """Forget every file and start describing a new index with ``signature``."""
+        with self._lock:
+            self._files = {}
+            self._signature = dict(signature)
+
+    def get(self, relpath: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._load().get(relpath)
+            return dict(entry) if entry else None
+
+    def paths(self) -> List[str]:
+        with self._lock:
+            return list(self._load())
+
+    def set(self, relpath: str, size: int, mtime_ns: int, sha256: str, chunks: List[str]) -> None:
+        with self._lock:
+            self._load()[relpath] = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "sha256": sha256,
+                "chunks": list(chunks),
+            }
+
+    def remove(self, relpath: str) -> Optional[dict]:
+        with self._lock:
+            return self._load().pop(relpath, None)
+
+    def save(self) -> None:
+        with self._lock:
+            if self._files is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"signature": self._signature, "files": self._files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,107 @@
+"""
+Content-addressed cache of LLM responses.
+
+Responses are keyed by a hash of the model, the prompt template version and
+the normalized inputs, so a paper that arrives again through another route,
+or a re-run after a crash, costs no tokens. Stored in SQLite with LRU
+eviction once ``max_entries`` is exceeded.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from optoagent.config import DATA_DIR, LLM_CACHE_MAX_ENTRIES
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+"""
+
+
+class LLMCache:
+    """SQLite-backed LRU cache for LLM completions with hit/miss counters."""
+
+    def __init__(self, path: str | None = None, max_entries: int | None = None):
+        self.path = path or os.path.join(DATA_DIR, "llm_cache.db")
+        self.max_entries = max_entries or LLM_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so constructing a summarizer never touches the disk
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, template: str, inputs: Dict[str, Any]) -> str:
+        """Hash model, prompt template version and normalized inputs into a cache key."""
+        blob = json.dumps(
+            {"model": model, "template": template, "inputs": inputs},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with conn:
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, last_access) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMCache:
+    """Process-wide cache used by PaperSummarizer (ideas are never cached)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
@@ -6,29 +6,48 @@ by looking up metadata via DOI or title search.
 """
 
 import re
-import time
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import unquote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
 
+from optoagent.config import METADATA_CROSSREF_CONCURRENCY, METADATA_S2_CONCURRENCY
+from optoagent.identifiers import extract_doi, strip_group_prefix, title_fingerprint
 from optoagent.logger import get_logger
+from optoagent.models import Paper
+from optoagent.modules.metadata_cache import MetadataCache
+from optoagent.modules.rate_limiter import request_with_retry
 
 logger = get_logger(__name__)
 
-# Rate limiting: Semantic Scholar allows 100 req/5min without key
+# Rate limiting is per host, see rate_limits in config.yaml
 _SEMANTIC_SCHOLAR_BASE = "https://api.semanticscholar.org/graph/v1"
 _CROSSREF_BASE = "https://api.crossref.org/works"
 
-# Polite delay between API calls (seconds)
-_API_DELAY = 0.5
+# Semantic Scholar /paper/batch accepts at most 500 IDs per request
+_S2_BATCH_SIZE = 500
+_S2_FIELDS = "title,authors,abstract,year,externalIds"
+
+# Returned by a lookup that could not get an answer (rate limited, 5xx,
+# timeout, ...). Unlike None ("the source does not know this paper") it must
+# not be cached as a miss.
+_FAILED = object()
 
 
 class MetadataEnricher:
     """Enriches paper metadata using Semantic Scholar and CrossRef APIs."""
 
-    def __init__(self, semantic_scholar_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        semantic_scholar_api_key: Optional[str] = None,
+        cache: Optional[MetadataCache] = None,
+        crossref_concurrency: Optional[int] = None,
+        s2_concurrency: Optional[int] = None,
+    ):
         self.s2_api_key = semantic_scholar_api_key
+        self._cache = cache or MetadataCache()
+        self.crossref_concurrency = crossref_concurrency or METADATA_CROSSREF_CONCURRENCY
+        self.s2_concurrency = s2_concurrency or METADATA_S2_CONCURRENCY
         self._session = requests.Session()
         self._session.headers.update({
             "User-Agent": "OptoAgent/1.0 (mailto:optoagent@example.com)",
@@ -45,26 +64,127 @@ class MetadataEnricher:
         """
         # Step 1: Try to extract DOI from URL
         doi = self._extract_doi(url)
+        cache_keys = self._cache_keys(doi, title)
+
+        cached = self._cache.get(cache_keys)
+        if cached is not None:
+            logger.debug("  Metadata cache hit: %s", title[:60])
+            if cached.get("enriched"):
+                return cached
+            return self._unenriched(current_authors, current_abstract)
+
+        result = self._lookup(doi, title)
+        if result is _FAILED:
+            # Not a real miss; leave it uncached so the next run asks again
+            result = None
+        else:
+            self._cache.put(cache_keys, result or {"enriched": False})
+        if result:
+            return result
 
-        # Step 2: Try Semantic Scholar by DOI
-        if doi:
-            result = self._lookup_semantic_scholar_doi(doi)
+        # Step 5: Fallback — return original data
+        logger.info("  Could not enrich metadata for: %s", title[:60])
+        return self._unenriched(current_authors, current_abstract)
+
+    def enrich_papers(self, papers: List[Paper]) -> List[Dict]:
+        """
+        Enrich a batch of papers, returning one enrichment dict per paper.
+
+        Cached papers are answered locally, all remaining DOIs are resolved in
+        chunks through Semantic Scholar's batch endpoint, and only the misses
+        fall back to CrossRef and then title search. Each fallback stage runs
+        concurrently under its own per-source cap; per-paper results are the
+        same as running ``enrich_paper`` on each paper in turn.
+        """
+        results: List[Optional[Dict]] = [None] * len(papers)
+        dois = [self._extract_doi(p.url) for p in papers]
+        keys = [self._cache_keys(doi, p.title) for doi, p in zip(dois, papers)]
+
+        pending = []
+        for i, p in enumerate(papers):
+            cached = self._cache.get(keys[i])
+            if cached is None:
+                pending.append(i)
+            elif cached.get("enriched"):
+                results[i] = cached
+            else:
+                results[i] = self._unenriched(p.authors, p.abstract)
+
+        # Step 2: Semantic Scholar by DOI, all at once
+        with_doi = [i for i in pending if dois[i]]
+        s2_hits = self._lookup_semantic_scholar_batch(sorted({dois[i] for i in with_doi}))
+        found: Dict[int, Dict] = {}
+        failed = set()  # papers some source failed to answer; their misses are not cached
+        self._collect(found, failed, with_doi, [s2_hits.get(dois[i]) for i in with_doi])
+
+        # Step 3: CrossRef by DOI, concurrently for the S2 misses
+        crossref_todo = [i for i in pending if i not in found and dois[i]]
+        crossref_hits = self._run_concurrently(
+            self._lookup_crossref_doi, [dois[i] for i in crossref_todo], self.crossref_concurrency
+        )
+        self._collect(found, failed, crossref_todo, crossref_hits)
+
+        # Step 4: Semantic Scholar title search for whatever is left
+        title_todo = [i for i in pending if i not in found]
+        title_hits = self._run_concurrently(
+            self._search_semantic_scholar_title, [papers[i].title for i in title_todo], self.s2_concurrency
+        )
+        self._collect(found, failed, title_todo, title_hits)
+
+        for i in pending:
+            result = found.get(i)
+            if result or i not in failed:
+                self._cache.put(keys[i], result or {"enriched": False})
             if result:
-                return result
+                results[i] = result
+            else:
+                # Step 5: Fallback — keep original data
+                logger.info("  Could not enrich metadata for: %s", papers[i].title[:60])
+                results[i] = self._unenriched(papers[i].authors, papers[i].abstract)
+        return results
 
-        # Step 3: Try CrossRef by DOI
+    @staticmethod
+    def _run_concurrently(fn: Callable, args: List, workers: int) -> List:
+        """Map ``fn`` over ``args`` on a bounded pool, preserving order."""
+        if len(args) <= 1 or workers <= 1:
+            return [fn(a) for a in args]
+        with ThreadPoolExecutor(max_workers=min(workers, len(args)), thread_name_prefix="enrich") as pool:
+            return list(pool.map(fn, args))
+
+    @staticmethod
+    def _collect(found: Dict[int, Dict], failed: set, indices: List[int], results: List) -> None:
+        """Record one lookup stage's hits in ``found`` and failures in ``failed``."""
+        for i, r in zip(indices, results):
+            if r is _FAILED:
+                failed.add(i)
+            elif r:
+                found[i] = r
+
+    def _lookup(self, doi: Optional[str], title: str):
+        """
+        Run the remote lookup chain for one paper.
+
+        Returns the first hit, None if every source answered that it does not
+        know the paper, or ``_FAILED`` if nothing hit and some source failed.
+        """
+        stages = []
         if doi:
-            result = self._lookup_crossref_doi(doi)
-            if result:
+            # Step 2: Semantic Scholar by DOI, step 3: CrossRef by DOI
+            stages += [lambda: self._lookup_semantic_scholar_doi(doi), lambda: self._lookup_crossref_doi(doi)]
+        # Step 4: Semantic Scholar title search
+        stages.append(lambda: self._search_semantic_scholar_title(title))
+
+        failed = False
+        for stage in stages:
+            result = stage()
+            if result is _FAILED:
+                failed = True
+            elif result:
                 return result
+        return _FAILED if failed else None
 
-        # Step 4: Try Semantic Scholar by title search
-        result = self._search_semantic_scholar_title(title)
-        if result:
-            return result
-
-        # Step 5: Fallback — return original data
-        logger.info("  Could not enrich metadata for: %s", title[:60])
+    @staticmethod
+    def _unenriched(current_authors: List[str], current_abstract: str) -> Dict:
         return {
             "authors": current_authors,
             "abstract": current_abstract,
@@ -72,79 +192,104 @@ class MetadataEnricher:
             "source": "exa_original",
         }
 
+    # ---- Cache keys ----
+
+    @staticmethod
+    def _cache_keys(doi: Optional[str], title: str) -> List[str]:
+        # A DOI identifies the paper on its own; titles ("Editorial", "Correction")
+        # can be shared, so they are only a key for papers without a DOI
+        if doi:
+            return [f"doi:{doi.lower()}"]
+        title_key = title_fingerprint(title)
+        return [f"title:{title_key}"] if title_key else []
+
     # ---- DOI Extraction ----
 
     @staticmethod
     def _extract_doi(url: str) -> Optional[str]:
         """Extract DOI from common academic publisher URLs."""
-        if not url:
-            return None
-
-        url = unquote(url)
-
-        # Pattern 1: /doi/10.xxxx/... (science.org, wiley, etc.)
-        m = re.search(r'/doi/?(10\.\d{4,}/[^\s?#]+)', url)
-        if m:
-            return m.group(1).rstrip('/')
-
-        # Pattern 2: nature.com/articles/s41xxx-xxx-xxxxx-x
-        m = re.search(r'nature\.com/articles/(s\d+[-\w]+)', url)
-        if m:
-            article_id = m.group(1)
-            # Nature DOIs follow pattern 10.1038/{article_id}
-            return f"10.1038/{article_id}"
-
-        # Pattern 3: pubs.acs.org/doi/10.xxxx/...
-        m = re.search(r'(10\.\d{4,}/[^\s?#]+)', url)
-        if m:
-            return m.group(1).rstrip('/')
-
-        return None
+        return extract_doi(url)
 
     # ---- Semantic Scholar ----
 
     def _lookup_semantic_scholar_doi(self, doi: str) -> Optional[Dict]:
         """Look up paper by DOI on Semantic Scholar."""
-        fields = "title,authors,abstract,year,externalIds"
-        api_url = f"{_SEMANTIC_SCHOLAR_BASE}/paper/DOI:{doi}?fields={fields}"
+        api_url = f"{_SEMANTIC_SCHOLAR_BASE}/paper/DOI:{doi}?fields={_S2_FIELDS}"
 
         try:
-            time.sleep(_API_DELAY)
-            resp = self._session.get(api_url, timeout=10)
+            resp = request_with_retry(self._session, "GET", api_url, timeout=10)
             if resp.status_code == 404:
                 logger.debug("  S2: DOI not found: %s", doi)
                 return None
             if resp.status_code == 429:
-                logger.warning("  S2: Rate limited, skipping DOI lookup")
-                return None
+                logger.warning("  S2: Still rate limited after retries, skipping DOI lookup")
+                return _FAILED
             resp.raise_for_status()
             data = resp.json()
             return self._parse_s2_result(data, "semantic_scholar_doi")
         except Exception as e:
             logger.debug("  S2 DOI lookup failed: %s", e)
-            return None
+            return _FAILED
+
+    def _lookup_semantic_scholar_batch(self, dois: List[str]) -> Dict:
+        """
+        Resolve many DOIs via Semantic Scholar's /paper/batch endpoint.
+
+        Maps each resolved DOI to its result, and each DOI whose chunk request
+        failed to ``_FAILED``; DOIs S2 does not know are left out.
+        """
+        found: Dict = {}
+        api_url = f"{_SEMANTIC_SCHOLAR_BASE}/paper/batch"
+
+        for start in range(0, len(dois), _S2_BATCH_SIZE):
+            chunk = dois[start:start + _S2_BATCH_SIZE]
+            try:
+                resp = request_with_retry(
+                    self._session,
+                    "POST",
+                    api_url,
+                    params={"fields": _S2_FIELDS},
+                    json={"ids": [f"DOI:{doi}" for doi in chunk]},
+                    timeout=30,
+                )
+                if resp.status_code == 429:
+                    logger.warning("  S2: Still rate limited after retries, skipping batch DOI lookup")
+                    found.update(dict.fromkeys(chunk, _FAILED))
+                    continue
+                resp.raise_for_status()
+                # Response is aligned with the request; unknown IDs come back as null
+                for doi, data in zip(chunk, resp.json()):
+                    result = self._parse_s2_result(data, "semantic_scholar_doi") if data else None
+                    if result:
+                        found[doi] = result
+            except Exception as e:
+                logger.debug("  S2 batch lookup failed: %s", e)
+                found.update(dict.fromkeys(chunk, _FAILED))
+
+        if dois:
+            resolved = sum(1 for r in found.values() if r is not _FAILED)
+            logger.info("  S2 batch: resolved %d/%d DOIs", resolved, len(dois))
+        return found
 
     def _search_semantic_scholar_title(self, title: str) -> Optional[Dict]:
         """Search Semantic Scholar by title."""
         # Clean title: remove [Group Name] prefix
-        clean_title = re.sub(r'^\[.*?\]\s*', '', title).strip()
+        clean_title = strip_group_prefix(title)
         if not clean_title or len(clean_title) < 10:
             return None
 
-        fields = "title,authors,abstract,year,externalIds"
         api_url = f"{_SEMANTIC_SCHOLAR_BASE}/paper/search"
         params = {
             "query": clean_title[:200],
             "limit": 3,
-            "fields": fields,
+            "fields": _S2_FIELDS,
         }
 
         try:
-            time.sleep(_API_DELAY)
-            resp = self._session.get(api_url, params=params, timeout=10)
+            resp = request_with_retry(self._session, "GET", api_url, params=params, timeout=10)
             if resp.status_code == 429:
-                logger.warning("  S2: Rate limited, skipping title search")
-                return None
+                logger.warning("  S2: Still rate limited after retries, skipping title search")
+                return _FAILED
             resp.raise_for_status()
             data = resp.json()
 
@@ -157,7 +302,7 @@ class MetadataEnricher:
             return None
         except Exception as e:
             logger.debug("  S2 title search failed: %s", e)
-            return None
+            return _FAILED
 
     @staticmethod
     def _parse_s2_result(data: dict, source: str) -> Optional[Dict]:
@@ -182,8 +327,7 @@ class MetadataEnricher:
         api_url = f"{_CROSSREF_BASE}/{doi}"
 
         try:
-            time.sleep(_API_DELAY)
-            resp = self._session.get(api_url, timeout=10)
+            resp = request_with_retry(self._session, "GET", api_url, timeout=10)
             if resp.status_code == 404:
                 logger.debug("  CrossRef: DOI not found: %s", doi)
                 return None
@@ -217,7 +361,7 @@ class MetadataEnricher:
             }
         except Exception as e:
             logger.debug("  CrossRef lookup failed: %s", e)
-            return None
+            return _FAILED
 
     # ---- Title matching ----
 
@@ -0,0 +1,100 @@
+"""
+Persistent cache of metadata enrichment results.
+
+Stores Semantic Scholar / CrossRef lookups in SQLite keyed by DOI (or, for
+papers without one, by normalized title), so a paper seen on every
+scheduled cycle is only looked up once per TTL. Misses are cached too, with
+a shorter TTL, so papers that are not indexed yet are retried reasonably
+soon. Expired rows are purged whenever the cache is opened.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from optoagent.config import DATA_DIR, METADATA_CACHE_TTL, METADATA_NEGATIVE_TTL
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichment (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class MetadataCache:
+    """SQLite-backed TTL cache for enrichment dicts."""
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+    ):
+        self.path = path or os.path.join(DATA_DIR, "metadata_cache.db")
+        self.ttl = ttl if ttl is not None else METADATA_CACHE_TTL
+        self.negative_ttl = negative_ttl if negative_ttl is not None else METADATA_NEGATIVE_TTL
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so constructing an enricher never touches the disk
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            with self._conn:
+                purged = self._conn.execute(
+                    "DELETE FROM enrichment WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+            if purged:
+                logger.debug("Purged %d expired metadata cache entries.", purged)
+        return self._conn
+
+    def get(self, keys: List[str]) -> Optional[Dict]:
+        """Return the first unexpired entry found under any of ``keys``."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for key in keys:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM enrichment WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    return json.loads(row[0])
+        return None
+
+    def put(self, keys: List[str], value: Dict) -> None:
+        """Store ``value`` under every key; misses (``enriched`` False) get the negative TTL."""
+        keys = [k for k in keys if k]
+        if not keys:
+            return
+        ttl = self.ttl if value.get("enriched") else self.negative_ttl
+        expires_at = time.time() + ttl
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO enrichment (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(k, payload, expires_at) for k in keys],
+                )
+
+    def purge_expired(self) -> int:
+        """Delete expired rows. Returns the number removed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                cur = conn.execute("DELETE FROM enrichment WHERE expires_at <= ?", (time.time(),))
+        return cur.rowcount
@@ -15,6 +15,7 @@ import requests
 from optoagent.config import APP_ID, APP_SECRET, FEISHU_WEBHOOK
 from optoagent.logger import get_logger
 from optoagent.models import Idea, Paper
+from optoagent.modules.rate_limiter import request_with_retry
 
 logger = get_logger(__name__)
 
@@ -32,6 +33,7 @@ class FeishuNotifier:
 
         self.token: Optional[str] = None
         self.token_expire_time: float = 0
+        self._session = requests.Session()
 
     # ---- Token management ----
 
@@ -49,7 +51,7 @@ class FeishuNotifier:
         payload = {"app_id": self.app_id, "app_secret": self.app_secret}
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = request_with_retry(self._session, "POST", url, json=payload, headers=headers, timeout=10)
             response.raise_for_status()
             data = response.json()
             if data.get("code") == 0:
@@ -88,7 +90,10 @@ class FeishuNotifier:
                 }
 
                 try:
-                    response = requests.post(url, params=params, headers=headers, json=payload)
+                    response = request_with_retry(
+                        self._session, "POST", url, params=params, headers=headers, json=payload, timeout=10,
+                        idempotent=False,
+                    )
                     if response.status_code != 200:
                         logger.error("API Send Failed: %s", response.text)
                     else:
@@ -101,7 +106,9 @@ class FeishuNotifier:
         if self.webhook_url:
             payload = {"msg_type": "text", "content": {"text": text}}
             try:
-                resp = requests.post(self.webhook_url, json=payload, timeout=10)
+                resp = request_with_retry(
+                    self._session, "POST", self.webhook_url, json=payload, timeout=10, idempotent=False
+                )
                 resp_data = resp.json()
                 if resp.status_code == 200 and resp_data.get("code") == 0:
                     logger.info("Message sent via Webhook (fallback).")
@@ -0,0 +1,141 @@
+"""
+Pure-NumPy vector index for small-to-medium corpora.
+
+A drop-in for the subset of the ChromaDB collection API that VectorStore
+uses (``upsert``, ``delete``, ``count``, ``query``), for deployments that
+do not want to run ChromaDB. Chunks and their vectors are stored in SQLite;
+searches are exact, vectorized brute-force squared-L2 scans over an
+in-memory matrix: a few milliseconds per query at 10^4 chunks and a few
+tens of milliseconds at 10^5 (384-dim vectors).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id       TEXT PRIMARY KEY,
+    document TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    vector   BLOB NOT NULL
+);
+"""
+
+
+class NumpyVectorIndex:
+    """SQLite-backed chunk store with exact brute-force nearest-neighbour search."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Search snapshot, rebuilt lazily after any write
+        self._ids: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def _snapshot(self) -> None:
+        if self._matrix is not None:
+            return
+        rows = self._connect().execute("SELECT id, vector FROM chunks").fetchall()
+        self._ids = [r[0] for r in rows]
+        if rows:
+            self._matrix = np.stack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        else:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.einsum("ij,ij->i", self._matrix, self._matrix)
+
+    # ---- Collection API ----
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[dict],
+        embeddings: Sequence,
+    ) -> None:
+        rows = [
+            (cid, doc, json.dumps(meta or {}, ensure_ascii=False), np.asarray(vec, dtype=np.float32).tobytes())
+            for cid, doc, meta, vec in zip(ids, documents, metadatas, embeddings)
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO chunks (id, document, metadata, vector) VALUES (?, ?, ?, ?)", rows
+                )
+            self._matrix = None
+
+    def delete(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM chunks WHERE id = ?", [(cid,) for cid in ids])
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Remove every stored chunk."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM chunks")
+            self._matrix = None
+
+    def query(self, query_embeddings: Sequence, n_results: int = 10) -> Dict[str, list]:
+        """Exact top-k by squared L2 distance, shaped like a ChromaDB query result."""
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        with self._lock:
+            self._snapshot()
+            ids, matrix, norms = self._ids, self._matrix, self._norms
+            conn = self._connect()
+
+            result: Dict[str, list] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+            k = min(n_results, len(ids))
+            if k == 0:
+                for key in result:
+                    result[key] = [[] for _ in queries]
+                return result
+
+            # |q - x|^2 = |q|^2 - 2 q.x + |x|^2 for every query at once
+            distances = (
+                np.einsum("ij,ij->i", queries, queries)[:, None] - 2.0 * queries @ matrix.T + norms[None, :]
+            )
+            top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+            for qi, candidates in enumerate(top):
+                order = candidates[np.argsort(distances[qi, candidates])]
+                hit_ids = [ids[i] for i in order]
+                placeholders = ",".join("?" * len(hit_ids))
+                stored = {
+                    r[0]: (r[1], json.loads(r[2]))
+                    for r in conn.execute(
+                        f"SELECT id, document, metadata FROM chunks WHERE id IN ({placeholders})", hit_ids
+                    )
+                }
+                result["ids"].append(hit_ids)
+                result["documents"].append([stored[i][0] for i in hit_ids])
+                result["metadatas"].append([stored[i][1] for i in hit_ids])
+                result["distances"].append([float(max(distances[qi, i], 0.0)) for i in order])
+            return result
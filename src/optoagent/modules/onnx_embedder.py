@@ -0,0 +1,122 @@
+"""
+all-MiniLM-L6-v2 sentence embeddings on ONNX Runtime.
+
+Runs the same ONNX export, tokenizer settings and mean pooling as
+ChromaDB's default embedding function, so vectors are interchangeable with
+it, but needs only ``onnxruntime`` and ``tokenizers``: the NumPy backend
+never imports ``chromadb``. The model is shared with ChromaDB's download
+location (``~/.cache/chroma/onnx_models``) and fetched on first use if
+missing.
+"""
+
+import hashlib
+import os
+import sys
+import tarfile
+import threading
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODEL_DIR = Path.home() / ".cache" / "chroma" / "onnx_models" / "all-MiniLM-L6-v2"
+_MODEL_URL = "https://chroma-onnx-models.s3.amazonaws.com/all-MiniLM-L6-v2/onnx.tar.gz"
+_MODEL_SHA256 = "913d7300ceae3b2dbc2c50d1de4baacab4be7b9380491c27fab7418616a16ec3"
+_MODEL_FILES = ("model.onnx", "tokenizer.json")
+_MAX_TOKENS = 256
+_BATCH_SIZE = 32
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MiniLMEmbedder:
+    """Callable mapping a list of texts to L2-normalized 384-dim float32 vectors."""
+
+    def __init__(self, model_dir: str | Path | None = None):
+        self.model_dir = Path(model_dir or MODEL_DIR)
+        self._lock = threading.Lock()
+        self._session = None
+        self._tokenizer = None
+
+    # ---- Model loading ----
+
+    def _download(self) -> None:
+        import requests
+
+        archive = self.model_dir / "onnx.tar.gz"
+        if not archive.exists() or _sha256(archive) != _MODEL_SHA256:
+            logger.info("Downloading embedding model to %s ...", self.model_dir)
+            self.model_dir.mkdir(parents=True, exist_ok=True)
+            tmp = archive.with_suffix(".tmp")
+            with requests.get(_MODEL_URL, stream=True, timeout=60) as resp:
+                resp.raise_for_status()
+                with open(tmp, "wb") as f:
+                    for block in resp.iter_content(chunk_size=1 << 20):
+                        f.write(block)
+            if _sha256(tmp) != _MODEL_SHA256:
+                tmp.unlink()
+                raise ValueError(f"Downloaded embedding model {_MODEL_URL} failed its SHA-256 check")
+            os.replace(tmp, archive)
+
+        with tarfile.open(archive, "r:gz") as tar:
+            if sys.version_info >= (3, 12):
+                tar.extractall(self.model_dir, filter="data")
+            else:
+                tar.extractall(self.model_dir)
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                return
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            onnx_dir = self.model_dir / "onnx"
+            if not all((onnx_dir / name).exists() for name in _MODEL_FILES):
+                self._download()
+
+            tokenizer = Tokenizer.from_file(str(onnx_dir / "tokenizer.json"))
+            tokenizer.enable_truncation(max_length=_MAX_TOKENS)
+            tokenizer.enable_padding(pad_id=0, pad_token="[PAD]", length=_MAX_TOKENS)
+
+            options = onnxruntime.SessionOptions()
+            options.log_severity_level = 3
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            providers = [p for p in onnxruntime.get_available_providers() if p != "CoreMLExecutionProvider"]
+            self._session = onnxruntime.InferenceSession(
+                str(onnx_dir / "model.onnx"), sess_options=options, providers=providers
+            )
+            self._tokenizer = tokenizer
+
+    # ---- Inference ----
+
+    def __call__(self, texts: Sequence[str]) -> List[np.ndarray]:
+        self._load()
+        vectors: List[np.ndarray] = []
+        for start in range(0, len(texts), _BATCH_SIZE):
+            encoded = self._tokenizer.encode_batch(list(texts[start:start + _BATCH_SIZE]))
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            hidden = self._session.run(None, {
+                "input_ids": input_ids,
+                "attention_mask": mask,
+                "token_type_ids": np.zeros_like(input_ids),
+            })[0]
+
+            # Mean over real tokens, then unit length (as sentence-transformers does)
+            weights = mask[:, :, None].astype(hidden.dtype)
+            pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            norms[norms == 0] = 1e-12
+            vectors.extend((pooled / norms).astype(np.float32))
+        return vectors
@@ -0,0 +1,210 @@
+"""
+Thread-safe token-bucket rate limiting for outbound API calls.
+
+Every upstream host (Semantic Scholar, CrossRef, Exa, Feishu) gets one
+shared bucket per process. ``request_with_retry`` waits for a token, honours
+``Retry-After`` on 429/5xx responses, backs off with jitter and retries
+instead of giving up on the first throttled response. A ``Retry-After``
+longer than the configured maximum backoff is not waited out: the response
+is returned so one throttled host cannot stall a scheduled job for an hour.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from optoagent.config import (
+    RATE_LIMIT_BACKOFF_BASE,
+    RATE_LIMIT_BACKOFF_MAX,
+    RATE_LIMIT_HOSTS,
+    RATE_LIMIT_MAX_RETRIES,
+)
+from optoagent.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status codes worth retrying: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens per second, bursts up to ``capacity``.
+
+    ``acquire`` blocks the calling thread until a token is available, so a
+    bucket can be shared by a pool of workers to cap their combined rate.
+    A non-positive rate disables limiting.
+
+    The bucket is adaptive: ``throttle`` halves the rate and pauses every
+    caller after a 429, and ``recover`` creeps back towards the configured
+    rate after each success.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` from the bucket, sleeping as needed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    if self.rate <= 0:
+                        return waited
+                    self._refill(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return waited
+                    delay = (tokens - self._tokens) / self.rate
+                else:
+                    delay = self._paused_until - now
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, pause: float) -> None:
+        """Back off after the upstream said slow down: pause everyone, halve the rate."""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + pause)
+            if self.rate > 0:
+                self.rate = max(self.max_rate / 16, self.rate / 2)
+                self._tokens = 0.0
+                self._updated = now
+
+    def recover(self) -> None:
+        """Additive increase back towards the configured rate."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str) -> TokenBucket:
+    """Return the process-wide bucket for ``host`` (unlimited if not configured)."""
+    host = host.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            limits = RATE_LIMIT_HOSTS.get(host, {})
+            bucket = TokenBucket(limits.get("rate", 0), limits.get("burst"))
+            _buckets[host] = bucket
+        return bucket
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _never_sent(exc: Exception) -> bool:
+    """True when the connection could not be opened, so the server never saw the request."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(exc, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+
+
+def _backoff(attempt: int, base: float) -> float:
+    """Exponential backoff with equal jitter."""
+    delay = min(RATE_LIMIT_BACKOFF_MAX, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def request_with_retry(
+    session: Any,
+    method: str,
+    url: str,
+    bucket: Optional[TokenBucket] = None,
+    max_retries: Optional[int] = None,
+    backoff_base: Optional[float] = None,
+    idempotent: bool = True,
+    **kwargs,
+) -> requests.Response:
+    """
+    Rate-limited ``session.request`` with retries on 429/5xx and connection errors.
+
+    ``session`` is anything with a ``request`` method (a ``requests.Session``
+    or the ``requests`` module). Returns the last response once retries are
+    exhausted, or as soon as the server asks to wait longer than the maximum
+    backoff; re-raises the last connection error if no response was ever
+    received.
+
+    Pass ``idempotent=False`` for requests that must not be repeated once
+    the server may have acted on them (e.g. sending a message): they are
+    retried only on 429 and on failures to connect, never on read timeouts
+    or 5xx.
+    """
+    bucket = bucket or get_bucket(urlsplit(url).netloc)
+    max_retries = RATE_LIMIT_MAX_RETRIES if max_retries is None else max_retries
+    backoff_base = RATE_LIMIT_BACKOFF_BASE if backoff_base is None else backoff_base
+
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= max_retries or not (idempotent or _never_sent(e)):
+                raise
+            delay = _backoff(attempt, backoff_base)
+            logger.debug("  %s %s failed (%s), retrying in %.1fs", method, url, e, delay)
+            time.sleep(delay)
+            continue
+
+        if resp.status_code not in RETRY_STATUSES:
+            bucket.recover()
+            return resp
+        if attempt >= max_retries or not (idempotent or resp.status_code == 429):
+            return resp
+
+        delay = _retry_after(resp)
+        if delay is None:
+            delay = _backoff(attempt, backoff_base)
+        elif delay > RATE_LIMIT_BACKOFF_MAX:
+            logger.warning(
+                "  %s %s -> %d with Retry-After %.0fs (over the %.0fs cap), giving up",
+                method, url, resp.status_code, delay, RATE_LIMIT_BACKOFF_MAX,
+            )
+            if resp.status_code == 429:
+                bucket.throttle(RATE_LIMIT_BACKOFF_MAX)
+            return resp
+        if resp.status_code == 429:
+            bucket.throttle(delay)
+        else:
+            time.sleep(delay)
+        logger.debug("  %s %s -> %d, retrying in %.1fs", method, url, resp.status_code, delay)
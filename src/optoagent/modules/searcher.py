@@ -4,24 +4,47 @@ Paper search module using Exa.ai and RSS feeds.
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
-import feedparser
 import requests
+from requests.adapters import HTTPAdapter
 
-from optoagent.config import ACADEMIC_DOMAINS, RESEARCH_GROUPS, RSS_FEEDS, SEARCH_DAYS_BACK
+from optoagent.config import (
+    ACADEMIC_DOMAINS,
+    EXA_MAX_CONCURRENCY,
+    EXA_RATE_LIMIT,
+    RESEARCH_GROUPS,
+    RSS_FEEDS,
+    SEARCH_DAYS_BACK,
+)
 from optoagent.logger import get_logger
 from optoagent.models import Paper
+from optoagent.modules.feed_fetcher import FeedFetcher
 from optoagent.modules.metadata import MetadataEnricher
+from optoagent.modules.rate_limiter import TokenBucket, request_with_retry
 
 logger = get_logger(__name__)
 
 
 class PaperSearcher:
-    def __init__(self, exa_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        exa_api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+    ):
         self.exa_api_key = exa_api_key
+        self.max_concurrency = max_concurrency or EXA_MAX_CONCURRENCY
         self._enricher = MetadataEnricher()
+        self._feed_fetcher = FeedFetcher()
+
+        # One pooled session and one rate budget shared by all Exa queries
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_concurrency)
+        self._session.mount("https://", adapter)
+        self._exa_bucket = TokenBucket(rate_limit if rate_limit is not None else EXA_RATE_LIMIT)
 
     def search_active(self, query: str, limit: int = 5, academic_only: bool = True) -> List[Paper]:
         """Active search using Exa.ai (if key provided) or simulation."""
@@ -41,26 +64,55 @@ class PaperSearcher:
         # 2. Check Research Groups (via Exa)
         if self.exa_api_key and RESEARCH_GROUPS:
             logger.info("Checking %d Research Groups via Exa...", len(RESEARCH_GROUPS))
-            for group in RESEARCH_GROUPS:
+            for _, group_papers in self.iter_research_groups(RESEARCH_GROUPS):
+                papers.extend(group_papers)
+
+        return papers
+
+    def commit_feed_state(self) -> None:
+        """Mark the RSS entries returned by ``monitor_sources`` as seen (call once they are stored)."""
+        self._feed_fetcher.commit_state()
+
+    def discard_feed_state(self) -> None:
+        """Forget the staged RSS state so unstored entries are fetched again next time."""
+        self._feed_fetcher.discard_state()
+
+    def iter_research_groups(self, groups: List[dict], limit: int = 3) -> Iterator[Tuple[str, List[Paper]]]:
+        """
+        Run one Exa search per research group concurrently.
+
+        Yields ``(group_name, papers)`` as each group finishes, with titles
+        prefixed by ``[group_name]``. Concurrency is capped by
+        ``max_concurrency`` and request rate by the shared Exa token bucket.
+        """
+        if not groups:
+            return
+        workers = min(self.max_concurrency, len(groups))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exa") as pool:
+            futures = {}
+            for group in groups:
                 group_name = group.get("name", "Unknown")
-                query = group.get("query", "")
                 logger.info("  Tracking Group: %s", group_name)
-                group_papers = self._search_exa(query, limit=3)
+                futures[pool.submit(self._search_exa, group.get("query", ""), limit)] = group_name
+
+            for future in as_completed(futures):
+                group_name = futures[future]
+                group_papers = future.result()
                 for p in group_papers:
                     p.title = f"[{group_name}] {p.title}"
-                papers.extend(group_papers)
-
-        return papers
+                logger.info("  Group done: %s (%d papers)", group_name, len(group_papers))
+                yield group_name, group_papers
 
     # ---- Internal methods ----
 
     def _check_rss_feeds(self, rss_feeds: List[str]) -> List[Paper]:
         new_papers: List[Paper] = []
-        for url in rss_feeds:
+        for url, entries in self._feed_fetcher.fetch_all(rss_feeds):
+            if entries is None:
+                continue
             try:
-                feed = feedparser.parse(url)
-                logger.info("  Parsed RSS %s: %d entries found.", url, len(feed.entries))
-                for entry in feed.entries[:3]:
+                logger.info("  Parsed RSS %s: %d new entries found.", url, len(entries))
+                for entry in entries[:3]:
                     p = Paper(
                         title=entry.title,
                         authors=[a.name for a in entry.get("authors", [])] or ["Unknown"],
@@ -115,7 +167,10 @@ class PaperSearcher:
             payload["includeDomains"] = ACADEMIC_DOMAINS
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = request_with_retry(
+                self._session, "POST", url, bucket=self._exa_bucket,
+                headers=headers, json=payload, timeout=60,
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -181,13 +236,8 @@ class PaperSearcher:
 
     def _enrich_papers(self, papers: List[Paper]) -> List[Paper]:
         """Enrich papers with accurate metadata from Semantic Scholar / CrossRef."""
-        for p in papers:
-            enrichment = self._enricher.enrich_paper(
-                title=p.title,
-                url=p.url,
-                current_authors=p.authors,
-                current_abstract=p.abstract,
-            )
+        enrichments = self._enricher.enrich_papers(papers)
+        for p, enrichment in zip(papers, enrichments):
             if enrichment.get("enriched"):
                 source = enrichment["source"]
                 # Update authors if enrichment found them
@@ -1,34 +1,84 @@
 """
-JSON-based storage layer for Papers, Experiments, and Ideas.
+Storage layer for Papers, Experiments, and Ideas.
 
-Handles CRUD operations and file persistence.
+Papers live in an indexed SQLite database (``papers.db``) so inserts and
+duplicate lookups by normalized title, DOI or URL stay cheap as the library
+grows. Each paper also stores a MinHash signature of its title and abstract,
+so reworded or re-sourced copies of a stored paper are caught as near
+duplicates before any summarization is spent on them. Experiments and Ideas
+remain plain JSON files.
 """
 
 import json
 import os
+import sqlite3
+import threading
 from dataclasses import asdict
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from optoagent.config import DATA_DIR
+from optoagent.config import DATA_DIR, DEDUP_NEAR_THRESHOLD
+from optoagent.identifiers import canonical_url, extract_doi, title_fingerprint
 from optoagent.logger import get_logger
 from optoagent.models import Experiment, Idea, Paper
 
 logger = get_logger(__name__)
 
+_PAPERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    title_key TEXT NOT NULL,
+    doi       TEXT,
+    url_key   TEXT,
+    data      TEXT NOT NULL,
+    minhash   BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_papers_title ON papers(title_key);
+CREATE INDEX IF NOT EXISTS idx_papers_doi ON papers(doi);
+CREATE INDEX IF NOT EXISTS idx_papers_url ON papers(url_key);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
 
 class Storage:
-    """Manages JSON-based persistence for Papers, Experiments, and Ideas."""
+    """Manages persistence for Papers (SQLite), Experiments and Ideas (JSON)."""
 
-    def __init__(self, data_dir: str | None = None):
+    def __init__(
+        self,
+        data_dir: str | None = None,
+        migrate_legacy: bool = True,
+        near_duplicate_threshold: float | None = DEDUP_NEAR_THRESHOLD,
+    ):
         self.data_dir = data_dir or DATA_DIR
+        self.papers_db = os.path.join(self.data_dir, "papers.db")
+        # Legacy whole-file JSON store, only read for migration
         self.papers_file = os.path.join(self.data_dir, "papers.json")
         self.experiments_file = os.path.join(self.data_dir, "experiments.json")
         self.ideas_file = os.path.join(self.data_dir, "ideas.json")
         self._ensure_data_dir()
 
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.papers_db, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_PAPERS_SCHEMA)
+        self._migrate_schema()
+
+        # Built from the stored signatures on first use; None when disabled
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._near_index = None
+
+        if migrate_legacy and not self._get_meta("legacy_migrated"):
+            self.migrate_legacy_papers()
+
     def _ensure_data_dir(self) -> None:
         os.makedirs(self.data_dir, exist_ok=True)
 
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
     def _load_data(self, filepath: str) -> List[Dict[str, Any]]:
         if not os.path.exists(filepath):
             return []
@@ -40,29 +90,254 @@ class Storage:
                 return []
 
     def _save_data(self, filepath: str, data: List[Dict[str, Any]]) -> None:
-        with open(filepath, "w", encoding="utf-8") as f:
+        # Write then rename, so readers never see a half-written file
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
+
+    def _append_data(self, filepath: str, record: Dict[str, Any]) -> None:
+        """Append one record to a JSON list file; the read-modify-write holds the lock."""
+        with self._lock:
+            data = self._load_data(filepath)
+            data.append(record)
+            self._save_data(filepath, data)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _migrate_schema(self) -> None:
+        """Bring databases created by older versions up to the current layout."""
+        with self._lock, self._conn:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(papers)")}
+            if "minhash" not in columns:
+                self._conn.execute("ALTER TABLE papers ADD COLUMN minhash BLOB")
+
+            if self._get_meta("title_key_version") != "2":
+                # Title keys now ignore group prefixes and punctuation, so two rows
+                # may legitimately share one: the index can no longer be unique
+                self._conn.execute("DROP INDEX IF EXISTS idx_papers_title")
+                rows = self._conn.execute("SELECT id, data FROM papers").fetchall()
+                self._conn.executemany(
+                    "UPDATE papers SET title_key = ? WHERE id = ?",
+                    [(title_fingerprint(json.loads(data)["title"]), pid) for pid, data in rows],
+                )
+                self._conn.execute("CREATE INDEX idx_papers_title ON papers(title_key)")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('title_key_version', '2')"
+                )
 
     # ---- Papers ----
 
+    @staticmethod
+    def _paper_keys(paper: Paper) -> tuple:
+        """Return (title_key, doi, url_key) used for indexing and dedup."""
+        doi = extract_doi(paper.url)
+        return (
+            title_fingerprint(paper.title),
+            doi.lower() if doi else None,
+            canonical_url(paper.url) or None,
+        )
+
+    @staticmethod
+    def _signature(paper: Paper):
+        from optoagent.modules.dedup import minhash, paper_text
+
+        return minhash(paper_text(paper.title, paper.abstract))
+
+    def _get_near_index(self):
+        """MinHash LSH index over stored papers, built on first use. Caller holds the lock."""
+        if not self.near_duplicate_threshold:
+            return None
+        if self._near_index is None:
+            import numpy as np
+
+            from optoagent.modules.dedup import NearDuplicateIndex
+
+            index = NearDuplicateIndex(self.near_duplicate_threshold)
+            rows = self._conn.execute("SELECT id, data, minhash FROM papers").fetchall()
+            backfill = []
+            for pid, data, blob in rows:
+                if blob is None:
+                    signature = self._signature(Paper(**json.loads(data)))
+                    if signature is not None:
+                        backfill.append((signature.tobytes(), pid))
+                else:
+                    signature = np.frombuffer(blob, dtype=np.uint32)
+                index.add(pid, signature)
+            if backfill:
+                with self._conn:
+                    self._conn.executemany("UPDATE papers SET minhash = ? WHERE id = ?", backfill)
+                logger.info("Computed near-duplicate signatures for %d stored papers.", len(backfill))
+            self._near_index = index
+        return self._near_index
+
+    def _find_near_duplicate(self, paper: Paper, signature, batch_index=None) -> bool:
+        """Check the stored library (and an optional batch index) for a near-duplicate."""
+        for index in (self._get_near_index(), batch_index):
+            match = index.find(signature) if index is not None else None
+            if match:
+                logger.info("Near-duplicate (similarity %.2f), skipping: %s", match[1], paper.title)
+                return True
+        return False
+
+    def _find_duplicate(self, title_key: str, doi: str | None, url_key: str | None) -> bool:
+        """Indexed lookup of an existing paper by title, DOI or URL."""
+        row = self._conn.execute(
+            "SELECT 1 FROM papers WHERE title_key = ? OR doi = ? OR url_key = ? LIMIT 1",
+            (title_key, doi, url_key),
+        ).fetchone()
+        return row is not None
+
+    def _insert(self, paper: Paper) -> bool:
+        """Insert a paper unless a duplicate exists. Caller holds the lock."""
+        keys = self._paper_keys(paper)
+        if self._find_duplicate(*keys):
+            return False
+        index = self._get_near_index()
+        signature = self._signature(paper) if index is not None else None
+        if signature is not None and self._find_near_duplicate(paper, signature):
+            return False
+        cursor = self._conn.execute(
+            "INSERT INTO papers (title_key, doi, url_key, data, minhash) VALUES (?, ?, ?, ?, ?)",
+            (
+                *keys,
+                json.dumps(asdict(paper), ensure_ascii=False),
+                signature.tobytes() if signature is not None else None,
+            ),
+        )
+        if index is not None:
+            index.add(cursor.lastrowid, signature)
+        return True
+
+    def has_paper(self, paper: Paper) -> bool:
+        """Check whether the same paper (by title, DOI or URL) or a near-duplicate is stored."""
+        with self._lock:
+            if self._find_duplicate(*self._paper_keys(paper)):
+                return True
+            if self._get_near_index() is None:
+                return False
+            return self._find_near_duplicate(paper, self._signature(paper))
+
     def add_paper(self, paper: Paper) -> None:
-        papers = self._load_data(self.papers_file)
-        if any(p["title"].lower() == paper.title.lower() for p in papers):
+        with self._lock, self._conn:
+            added = self._insert(paper)
+        if not added:
             logger.info("Paper already exists: %s", paper.title)
             return
-        papers.append(asdict(paper))
-        self._save_data(self.papers_file, papers)
         logger.info("Added paper: %s", paper.title)
 
+    def filter_new(self, papers: List[Paper]) -> List[Paper]:
+        """
+        Return the papers that are not stored yet, in input order.
+
+        Runs against a single read snapshot and also drops duplicates within
+        the batch itself, so the result can be passed to ``add_papers``.
+        Besides exact title/DOI/URL matches, papers whose title and abstract
+        are near-duplicates of a stored or earlier batch paper are dropped.
+        """
+        fresh: List[Paper] = []
+        seen: set = set()
+        batch_index = None
+        with self._lock, self._conn:
+            near_enabled = self._get_near_index() is not None
+            if near_enabled:
+                from optoagent.modules.dedup import NearDuplicateIndex
+
+                batch_index = NearDuplicateIndex(self.near_duplicate_threshold)
+            for i, paper in enumerate(papers):
+                title_key, doi, url_key = self._paper_keys(paper)
+                batch_keys = {k for k in (("t", title_key), ("d", doi), ("u", url_key)) if k[1]}
+                if seen & batch_keys or self._find_duplicate(title_key, doi, url_key):
+                    continue
+                if near_enabled:
+                    signature = self._signature(paper)
+                    if self._find_near_duplicate(paper, signature, batch_index):
+                        continue
+                    batch_index.add(i, signature)
+                seen |= batch_keys
+                fresh.append(paper)
+        return fresh
+
+    def add_papers(self, papers: List[Paper]) -> List[Paper]:
+        """Insert a batch of papers in one transaction. Returns those actually added."""
+        added: List[Paper] = []
+        with self._lock, self._conn:
+            for paper in papers:
+                if self._insert(paper):
+                    added.append(paper)
+        if added:
+            logger.info("Added %d papers.", len(added))
+        return added
+
     def get_papers(self) -> List[Paper]:
-        return [Paper(**p) for p in self._load_data(self.papers_file)]
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM papers ORDER BY id").fetchall()
+        return [Paper(**json.loads(r[0])) for r in rows]
+
+    def get_recent_papers(self, limit: int = 5) -> List[Paper]:
+        """The ``limit`` most recently added papers, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM papers ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [Paper(**json.loads(r[0])) for r in reversed(rows)]
+
+    def get_papers_since(self, after_id: int = 0, limit: int | None = None) -> List[Tuple[int, Paper]]:
+        """Papers added after row ``after_id`` as (id, paper), in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM papers WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [(pid, Paper(**json.loads(data))) for pid, data in rows]
+
+    def get_papers_by_ids(self, ids: List[int]) -> Dict[int, Paper]:
+        """Papers for the given row IDs (missing IDs are left out)."""
+        found: Dict[int, Paper] = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(ids), 500):
+                batch = list(ids[start:start + 500])
+                placeholders = ",".join("?" * len(batch))
+                for pid, data in self._conn.execute(
+                    f"SELECT id, data FROM papers WHERE id IN ({placeholders})", batch
+                ):
+                    found[pid] = Paper(**json.loads(data))
+        return found
+
+    def count_papers(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def migrate_legacy_papers(self, filepath: str | None = None) -> int:
+        """
+        Import papers from the legacy ``papers.json`` into the database.
+
+        Duplicates are skipped, so running it more than once is harmless.
+        Returns the number of papers imported.
+        """
+        filepath = filepath or self.papers_file
+        legacy = self._load_data(filepath)
+        added = 0
+        with self._lock, self._conn:
+            for p in legacy:
+                if self._insert(Paper(**p)):
+                    added += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_migrated', ?)",
+                (filepath,),
+            )
+        if legacy:
+            logger.info("Migrated %d/%d papers from %s.", added, len(legacy), filepath)
+        return added
 
     # ---- Experiments ----
 
     def add_experiment(self, experiment: Experiment) -> None:
-        experiments = self._load_data(self.experiments_file)
-        experiments.append(asdict(experiment))
-        self._save_data(self.experiments_file, experiments)
+        self._append_data(self.experiments_file, asdict(experiment))
         logger.info("Added experiment: %s", experiment.title)
 
     def get_experiments(self) -> List[Experiment]:
@@ -71,9 +346,7 @@ class Storage:
     # ---- Ideas ----
 
     def add_idea(self, idea: Idea) -> None:
-        ideas = self._load_data(self.ideas_file)
-        ideas.append(asdict(idea))
-        self._save_data(self.ideas_file, ideas)
+        self._append_data(self.ideas_file, asdict(idea))
         logger.info("Added idea: %s", idea.title)
 
     def get_ideas(self) -> List[Idea]:
@@ -2,14 +2,20 @@
 LLM-based paper summarization module.
 """
 
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
-from optoagent.config import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL
+from optoagent.config import LLM_MAX_CONCURRENCY, OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL
+from optoagent.identifiers import normalize_title, strip_group_prefix
 from optoagent.logger import get_logger
 from optoagent.models import Paper
+from optoagent.modules.llm_cache import LLMCache, get_default_cache
 
 logger = get_logger(__name__)
 
+# Bump whenever the prompt below changes so cached summaries are not reused
+PROMPT_VERSION = "summary-v1"
+
 try:
     from openai import OpenAI
 except ImportError:
@@ -22,9 +28,13 @@ class PaperSummarizer:
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[LLMCache] = None,
     ):
         self.api_key = api_key or OPENAI_API_KEY
         self.model = model or OPENAI_MODEL
+        self.max_concurrency = max_concurrency or LLM_MAX_CONCURRENCY
+        self.cache = cache or get_default_cache()
         base_url = base_url or OPENAI_BASE_URL
 
         self.client = (
@@ -38,6 +48,12 @@ class PaperSummarizer:
         if not self.client:
             return self._summarize_simulated(paper)
 
+        cache_key = self._cache_key(paper)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info("Summary cache hit: %s", paper.title[:60])
+            return cached
+
         try:
             prompt = f"""Please summarize the following paper for a researcher:
 
@@ -57,10 +73,37 @@ Instructions:
                     {"role": "user", "content": prompt},
                 ],
             )
-            return response.choices[0].message.content
+            summary = response.choices[0].message.content
+            self.cache.put(cache_key, summary)
+            return summary
         except Exception as e:
             logger.error("LLM Summarization failed: %s", e)
             return self._summarize_simulated(paper)
 
+    def summarize_many(self, papers: List[Paper]) -> List[str]:
+        """
+        Summarize several papers concurrently, at most ``max_concurrency`` in flight.
+
+        Results are returned in input order; a failed request falls back to
+        the simulated summary for that paper only.
+        """
+        if len(papers) <= 1 or not self.client:
+            return [self.summarize(p) for p in papers]
+        workers = min(self.max_concurrency, len(papers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+            return list(pool.map(self.summarize, papers))
+
+    def _cache_key(self, paper: Paper) -> str:
+        """Key on the paper content, ignoring the route it arrived by."""
+        return LLMCache.make_key(
+            self.model,
+            PROMPT_VERSION,
+            {
+                "title": normalize_title(strip_group_prefix(paper.title)),
+                "authors": [a.strip() for a in paper.authors],
+                "abstract": " ".join((paper.abstract or "").split()),
+            },
+        )
+
     def _summarize_simulated(self, paper: Paper) -> str:
         return f"[Simulated Summary] {paper.title} is about {paper.abstract[:50]}..."
@@ -1,54 +1,236 @@
 """
-ChromaDB-based vector store for RAG (Retrieval-Augmented Generation).
+Vector store for RAG (Retrieval-Augmented Generation).
 
-Handles document indexing and semantic similarity search.
+Handles document indexing and semantic similarity search, over both the
+knowledge-base notes and the library of stored papers. Vectors are kept
+in ChromaDB by default, or in a pure-NumPy index (``rag.backend: numpy``)
+for low-footprint deployments. VectorStore computes embeddings itself,
+through a persistent embedding cache, so no text is embedded twice. The
+default all-MiniLM-L6-v2 model runs directly on ONNX Runtime, so the NumPy
+backend never imports ``chromadb``. The client, the embedding model and the collection handle are
+created on first use and reused, so repeated queries in a long-running
+process only pay for embedding the query and the nearest-neighbour search.
 """
 
+import json
 import os
-from typing import List
+import threading
+from typing import Callable, Dict, Iterable, List
 
-from optoagent.config import DATA_DIR
+from optoagent.config import (
+    DATA_DIR,
+    RAG_BACKEND,
+    RAG_BATCH_SIZE,
+    RAG_CHECKPOINT_EVERY,
+    RAG_CHUNK_OVERLAP,
+    RAG_CHUNK_SIZE,
+    RAG_EMBEDDING_CACHE,
+    RAG_EXTRACT_WORKERS,
+    RAG_PDF_TIMEOUT,
+)
 from optoagent.logger import get_logger
+from optoagent.models import Paper
+from optoagent.modules.chunker import chunk_id, chunk_text
+from optoagent.modules.document_reader import iter_documents
+from optoagent.modules.embedding_cache import EmbeddingCache
+from optoagent.modules.index_manifest import IndexManifest, hash_file
 
 logger = get_logger(__name__)
 
+COLLECTION_NAME = "research_notes"
+# Bump when chunk IDs or chunk boundaries change, so existing indexes are rebuilt
+INDEX_FORMAT = 2
+PAPERS_COLLECTION = "papers"
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+_SUPPORTED_EXTENSIONS = (".md", ".txt", ".pdf")
+
+_default_ef = None
+_default_ef_lock = threading.Lock()
+
+
+def get_default_embedding_function():
+    """Process-wide all-MiniLM-L6-v2 embedding function (loads the ONNX model once)."""
+    global _default_ef
+    with _default_ef_lock:
+        if _default_ef is None:
+            from optoagent.modules.onnx_embedder import MiniLMEmbedder
+
+            _default_ef = MiniLMEmbedder()
+        return _default_ef
+
+
+def paper_document(paper: Paper) -> str:
+    """Text embedded for a stored paper: its title, abstract and summary."""
+    return "\n".join(part for part in (paper.title, paper.abstract, paper.summary) if part)
+
+
+class _BatchWriter:
+    """Streams chunks into fixed-size upserts; files are recorded once all their chunks are written."""
+
+    def __init__(self, collection, embed: Callable[[List[str]], list], manifest: IndexManifest,
+                 batch_size: int, checkpoint_every: int):
+        self.collection = collection
+        self.embed = embed
+        self.manifest = manifest
+        self.batch_size = max(1, batch_size)
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.batches = 0
+        self.chunks = 0
+
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[dict] = []
+        self._finished: list = []
+
+    def add(self, chunk_id: str, document: str, metadata: dict) -> None:
+        self._ids.append(chunk_id)
+        self._documents.append(document)
+        self._metadatas.append(metadata)
+        if len(self._ids) >= self.batch_size:
+            self.flush()
+
+    def finish_file(self, relpath: str, size: int, mtime_ns: int, sha256: str,
+                    previous: List[str], ids: List[str]) -> None:
+        """Mark a file complete; it is recorded after the batch holding its last chunk is written."""
+        self._finished.append((relpath, size, mtime_ns, sha256, previous, ids))
+        if not self._ids:
+            self.flush()
+
+    def flush(self) -> None:
+        checkpoint = False
+        if self._ids:
+            self.collection.upsert(
+                ids=self._ids,
+                documents=self._documents,
+                metadatas=self._metadatas,
+                embeddings=self.embed(self._documents),
+            )
+            self.chunks += len(self._ids)
+            self.batches += 1
+            self._ids, self._documents, self._metadatas = [], [], []
+            checkpoint = self.batches % self.checkpoint_every == 0
+
+        for relpath, size, mtime_ns, sha256, previous, ids in self._finished:
+            stale = set(previous) - set(ids)
+            if stale:
+                self.collection.delete(ids=list(stale))
+            self.manifest.set(relpath, size, mtime_ns, sha256, ids)
+        self._finished = []
+
+        if checkpoint:
+            self.manifest.save()
+            logger.info("Indexed %d chunks so far...", self.chunks)
+
 
 class VectorStore:
-    """Manages ChromaDB vector indexing and retrieval for the knowledge base."""
+    """Manages vector indexing and retrieval for the knowledge base."""
 
-    def __init__(self, data_dir: str | None = None):
+    def __init__(self, data_dir: str | None = None, embedding_function=None, backend: str | None = None):
         self.data_dir = data_dir or DATA_DIR
-        self.db_path = os.path.join(self.data_dir, "chroma_db")
+        self.backend = backend or RAG_BACKEND
+        if self.backend not in ("chroma", "numpy"):
+            raise ValueError(f"Unknown vector store backend: {self.backend}")
+        self.db_path = os.path.join(self.data_dir, "chroma_db" if self.backend == "chroma" else "vector_index")
         self.knowledge_dir = os.path.join(self.data_dir, "knowledge")
+        self.manifest_path = os.path.join(self.db_path, "index_manifest.json")
+        self.papers_state_path = os.path.join(self.db_path, "papers_index.json")
+        self.extract_workers = RAG_EXTRACT_WORKERS or None
+        self.pdf_timeout = RAG_PDF_TIMEOUT
+        self.batch_size = RAG_BATCH_SIZE
+        self.checkpoint_every = RAG_CHECKPOINT_EVERY
+        self.chunk_size = RAG_CHUNK_SIZE
+        self.chunk_overlap = RAG_CHUNK_OVERLAP
 
-    def _get_collection(self):
-        """Get or create the ChromaDB collection."""
-        import chromadb
-        from chromadb.utils import embedding_functions
-
-        client = chromadb.PersistentClient(path=self.db_path)
-        ef = embedding_functions.DefaultEmbeddingFunction()
-        return client.get_or_create_collection(
-            name="research_notes",
-            embedding_function=ef,
+        self.embedding_cache = (
+            EmbeddingCache(os.path.join(self.data_dir, "embedding_cache")) if RAG_EMBEDDING_CACHE else None
         )
 
+        self._embedding_function = embedding_function
+        # Fixed for the store's lifetime: it keys the embedding cache, and is
+        # known without loading the default model
+        self._model_id = DEFAULT_MODEL if embedding_function is None else self._describe(embedding_function)
+        self._client = None
+        self._collections: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._papers_lock = threading.Lock()
+
+    def _get_collection(self, name: str = COLLECTION_NAME):
+        """Get or create a collection, building the client on first use."""
+        with self._lock:
+            if name not in self._collections:
+                if self.backend == "numpy":
+                    from optoagent.modules.numpy_index import NumpyVectorIndex
+
+                    self._collections[name] = NumpyVectorIndex(os.path.join(self.db_path, f"{name}.db"))
+                else:
+                    import chromadb
+
+                    if self._client is None:
+                        self._client = chromadb.PersistentClient(path=self.db_path)
+                    # Embeddings are supplied by VectorStore, not by the collection
+                    self._collections[name] = self._client.get_or_create_collection(
+                        name=name,
+                        embedding_function=None,
+                    )
+            return self._collections[name]
+
+    def _drop_collection(self, name: str) -> None:
+        """Delete every vector in a collection."""
+        collection = self._get_collection(name)
+        with self._lock:
+            if self.backend == "numpy":
+                collection.clear()
+            else:
+                self._client.delete_collection(name)
+            self._collections.pop(name, None)
+
+    def _index_signature(self) -> dict:
+        """Everything that decides chunk IDs and vectors; a change means a rebuild."""
+        return {
+            "format": INDEX_FORMAT,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "model": self._model_name(),
+        }
+
+    def _get_embedding_function(self):
+        if self._embedding_function is None:
+            self._embedding_function = get_default_embedding_function()
+        return self._embedding_function
+
     @staticmethod
-    def _read_text_file(filepath: str) -> str:
-        """Read a text file, trying multiple encodings."""
-        for enc in ("utf-8", "utf-8-sig", "utf-16", "gbk", "latin-1"):
-            try:
-                with open(filepath, "r", encoding=enc) as f:
-                    return f.read()
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        logger.warning("Could not decode file %s with any encoding, skipping.", filepath)
-        return ""
+    def _describe(ef) -> str:
+        name = getattr(ef, "name", None)
+        return name() if callable(name) else type(ef).__name__
+
+    def _model_name(self) -> str:
+        return self._model_id
+
+    def _embed(self, texts: List[str]) -> list:
+        """Embed texts in one batch, reusing cached vectors; the model is loaded only on a miss."""
+        if self.embedding_cache is None:
+            return list(self._get_embedding_function()(texts))
+        return self.embedding_cache.embed(
+            texts,
+            lambda missing: self._get_embedding_function()(missing),
+            model=self._model_name(),
+        )
 
     def index_documents(self, source_dir: str | None = None) -> None:
         """
-        Index PDF and Markdown files from source_dir into ChromaDB.
-        Files are chunked at 1000 characters and embedded with all-MiniLM-L6-v2.
+        Incrementally index PDF and Markdown files from source_dir into ChromaDB.
+
+        Files whose size and mtime (or, failing that, content hash) match the
+        manifest are skipped; changed files are re-chunked and their stale
+        chunks removed, and chunks of deleted files are dropped. PDFs are
+        parsed in parallel worker processes, and chunks are embedded and
+        upserted in fixed-size batches as they arrive, with the manifest
+        checkpointed along the way. Files are split at heading, paragraph and
+        sentence boundaries into overlapping chunks whose IDs hash their
+        content, so only chunks that actually changed are re-embedded. If the
+        chunking settings or the embedding model differ from those the index
+        was built with (or the index predates the manifest), it is rebuilt.
+        Embeddings use all-MiniLM-L6-v2.
         """
         source_dir = source_dir or self.knowledge_dir
 
@@ -58,61 +240,232 @@ class VectorStore:
             return
 
         collection = self._get_collection()
+        manifest = IndexManifest(self.manifest_path)
+
+        signature = self._index_signature()
+        if manifest.signature != signature:
+            # Chunks written under other settings (or by versions without a
+            # manifest, with "file_N" IDs) cannot be matched up: start over
+            if collection.count():
+                logger.info("Knowledge index settings changed, rebuilding the index.")
+                self._drop_collection(COLLECTION_NAME)
+                collection = self._get_collection()
+            manifest.reset(signature)
 
         logger.info("Scanning %s for knowledge...", source_dir)
-        ids: List[str] = []
-        documents: List[str] = []
-        metadatas: List[dict] = []
+        seen = set()
+        unchanged = 0
+        # filepath -> (relpath, size, mtime_ns, sha256, previous chunk IDs)
+        pending: dict = {}
 
         for root, _, files in os.walk(source_dir):
             for file in files:
+                if not file.endswith(_SUPPORTED_EXTENSIONS):
+                    continue
                 filepath = os.path.join(root, file)
-                content = ""
-
-                if file.endswith((".md", ".txt")):
-                    content = self._read_text_file(filepath)
-                elif file.endswith(".pdf"):
-                    try:
-                        from pypdf import PdfReader
-
-                        reader = PdfReader(filepath)
-                        content = "\n".join(page.extract_text() for page in reader.pages)
-                    except Exception as e:
-                        logger.warning("Failed to read PDF %s: %s", file, e)
-                        continue
+                relpath = os.path.relpath(filepath, source_dir).replace(os.sep, "/")
+                seen.add(relpath)
+
+                stat = os.stat(filepath)
+                entry = manifest.get(relpath)
+                if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    unchanged += 1
+                    continue
+
+                sha256 = hash_file(filepath)
+                if entry and entry["sha256"] == sha256:
+                    # Touched but not modified: refresh the fingerprint only
+                    manifest.set(relpath, stat.st_size, stat.st_mtime_ns, sha256, entry["chunks"])
+                    unchanged += 1
+                    continue
+
+                previous = entry["chunks"] if entry else []
+                pending[filepath] = (relpath, stat.st_size, stat.st_mtime_ns, sha256, previous)
 
-                if content:
-                    chunks = [content[i : i + 1000] for i in range(0, len(content), 1000)]
-                    for idx, chunk in enumerate(chunks):
-                        ids.append(f"{file}_{idx}")
-                        documents.append(chunk)
-                        metadatas.append({"source": file, "chunk_id": idx})
-
-        if documents:
-            collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
-            logger.info("Indexed %d chunks from local knowledge base.", len(documents))
-        else:
-            logger.info("No documents found to index.")
-
-    def query_similar_context(self, query: str, n_results: int = 3) -> str:
-        """Retrieve relevant context from ChromaDB as a single string."""
+        indexed = 0
+        writer = _BatchWriter(collection, self._embed, manifest, self.batch_size, self.checkpoint_every)
         try:
-            import chromadb
-            from chromadb.utils import embedding_functions
+            documents = iter_documents(pending, max_workers=self.extract_workers, timeout=self.pdf_timeout)
+            for filepath, content in documents:
+                if content is None:
+                    continue
+                relpath, size, mtime_ns, sha256, previous = pending[filepath]
+                known = set(previous)
+
+                ids = []
+                for chunk in chunk_text(content, self.chunk_size, self.chunk_overlap):
+                    cid = chunk_id(relpath, chunk)
+                    if cid in ids:
+                        continue
+                    ids.append(cid)
+                    # Content-addressed IDs: chunks that did not change are already stored
+                    if cid not in known:
+                        writer.add(cid, chunk, {"source": relpath})
+                writer.finish_file(relpath, size, mtime_ns, sha256, previous, ids)
+                indexed += 1
+            writer.flush()
+
+            removed = 0
+            for relpath in manifest.paths():
+                if relpath not in seen:
+                    entry = manifest.remove(relpath)
+                    if entry["chunks"]:
+                        collection.delete(ids=entry["chunks"])
+                    removed += 1
+        finally:
+            # Files whose chunks were all written are kept, so an interrupted run resumes
+            manifest.save()
+
+        logger.info(
+            "Knowledge index updated: %d files indexed (%d chunks), %d unchanged, %d removed.",
+            indexed, writer.chunks, unchanged, removed,
+        )
+
+    def _search(self, name: str, queries: List[str], n_results: int) -> List[dict]:
+        """Batched search of one collection; hits merged by ID and ranked best first."""
+        queries = [q for q in queries if q and q.strip()]
+        if not queries:
+            return []
+
+        collection = self._get_collection(name)
+        available = collection.count()
+        if available == 0:
+            return []
+
+        results = collection.query(
+            query_embeddings=self._embed(queries), n_results=min(n_results, available)
+        )
+
+        merged: dict = {}
+        for ids, docs, metas, dists in zip(
+            results["ids"], results["documents"], results["metadatas"], results["distances"]
+        ):
+            for cid, doc, meta, dist in zip(ids, docs, metas, dists):
+                hit = merged.get(cid)
+                if hit is None:
+                    merged[cid] = {
+                        "id": cid,
+                        "document": doc,
+                        "metadata": meta or {},
+                        "distance": dist,
+                        "hits": 1,
+                    }
+                else:
+                    hit["distance"] = min(hit["distance"], dist)
+                    hit["hits"] += 1
 
-            client = chromadb.PersistentClient(path=self.db_path)
-            ef = embedding_functions.DefaultEmbeddingFunction()
-            collection = client.get_collection(name="research_notes", embedding_function=ef)
+        return sorted(merged.values(), key=lambda h: (h["distance"], -h["hits"]))
 
-            results = collection.query(query_texts=[query], n_results=n_results)
+    def query_many(self, queries: List[str], n_results: int = 3) -> List[dict]:
+        """
+        Retrieve the best chunks for several queries with one batched search.
 
-            context_parts = []
-            if results["documents"]:
-                for idx, doc in enumerate(results["documents"][0]):
-                    meta = results["metadatas"][0][idx]
-                    context_parts.append(f"[Source: {meta['source']}]\n{doc}")
+        All queries are embedded in a single batch and searched together; hits
+        are merged, de-duplicated by chunk ID (keeping the closest distance)
+        and reranked, chunks matched by several queries first among equals.
+        Returns up to ``n_results`` dicts with id, document, source, distance
+        and hits (the number of queries that matched the chunk).
+        """
+        return [
+            {
+                "id": h["id"],
+                "document": h["document"],
+                "source": h["metadata"].get("source", ""),
+                "distance": h["distance"],
+                "hits": h["hits"],
+            }
+            for h in self._search(COLLECTION_NAME, queries, n_results)[:n_results]
+        ]
 
-            return "\n\n".join(context_parts)
-        except Exception:
-            # Collection might not exist yet
+    def query_similar_context(self, query: str | List[str], n_results: int = 3) -> str:
+        """Retrieve relevant context for one query (or several) as a single string."""
+        queries = [query] if isinstance(query, str) else list(query)
+        try:
+            hits = self.query_many(queries, n_results=n_results)
+        except Exception as e:
+            logger.warning("Context retrieval failed: %s", e)
             return ""
+        return "\n\n".join(f"[Source: {h['source']}]\n{h['document']}" for h in hits)
+
+    # ---- Paper library ----
+
+    def _load_papers_state(self) -> dict:
+        if os.path.exists(self.papers_state_path):
+            try:
+                with open(self.papers_state_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                logger.warning("Failed to parse %s, re-indexing papers from scratch.", self.papers_state_path)
+        return {"last_id": 0}
+
+    def _save_papers_state(self, state: dict) -> None:
+        os.makedirs(self.db_path, exist_ok=True)
+        tmp_path = self.papers_state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.papers_state_path)
+
+    def index_papers(self, storage) -> int:
+        """
+        Embed the papers added to ``storage`` since the last call.
+
+        Each paper's title, abstract and summary is embedded once, keyed by its
+        Storage row ID. Progress is a high-water mark on those IDs, saved after
+        every batch, so an interrupted run resumes where it stopped and a call
+        with nothing new costs one SQLite query. Returns the number indexed.
+        """
+        with self._papers_lock:
+            state = self._load_papers_state()
+            collection = self._get_collection(PAPERS_COLLECTION)
+            indexed = 0
+            while True:
+                rows = storage.get_papers_since(state["last_id"], limit=self.batch_size)
+                if not rows:
+                    break
+                documents = [paper_document(p) for _, p in rows]
+                collection.upsert(
+                    ids=[str(pid) for pid, _ in rows],
+                    documents=documents,
+                    metadatas=[
+                        {"title": p.title, "url": p.url or "", "published_date": p.published_date or ""}
+                        for _, p in rows
+                    ],
+                    embeddings=self._embed(documents),
+                )
+                state["last_id"] = rows[-1][0]
+                self._save_papers_state(state)
+                indexed += len(rows)
+
+        if indexed:
+            logger.info("Paper index updated: %d papers added.", indexed)
+        return indexed
+
+    def related_papers(
+        self,
+        query: str | List[str],
+        n_results: int = 5,
+        exclude: Iterable[int] = (),
+    ) -> List[dict]:
+        """
+        Stored papers most similar to a query (or several), best first.
+
+        Returns up to ``n_results`` dicts with id (the Storage row ID), title,
+        url, published_date, distance and hits; IDs in ``exclude`` are skipped.
+        Call ``index_papers`` first to include recently added papers.
+        """
+        queries = [query] if isinstance(query, str) else list(query)
+        excluded = {str(pid) for pid in exclude}
+        related = []
+        for hit in self._search(PAPERS_COLLECTION, queries, n_results + len(excluded)):
+            if hit["id"] in excluded:
+                continue
+            meta = hit["metadata"]
+            related.append({
+                "id": int(hit["id"]),
+                "title": meta.get("title", ""),
+                "url": meta.get("url", ""),
+                "published_date": meta.get("published_date", ""),
+                "distance": hit["distance"],
+                "hits": hit["hits"],
+            })
+        return related[:n_results]
@@ -1,36 +1,104 @@
 """
 Continuous scheduler for OptoAgent.
 
-Periodically runs monitor_sources and/or run_cycle via subprocess.
+Periodically runs monitor_sources and run_cycle as concurrent in-process
+jobs against one long-lived AgentService. Each job has a timeout, and a
+job whose previous run is still going is skipped rather than started twice.
 """
 
 import argparse
-import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, Optional
 
 import schedule
 
-from optoagent.config import DEFAULT_QUERY, SCHEDULER_INTERVAL, SCHEDULER_UNIT
+from optoagent.config import (
+    DEFAULT_QUERY,
+    SCHEDULER_INTERVAL,
+    SCHEDULER_JOB_TIMEOUT,
+    SCHEDULER_UNIT,
+)
 from optoagent.logger import get_logger
+from optoagent.service import AgentService
 
 logger = get_logger(__name__)
 
-
-def _job(query: str) -> None:
-    """Execute one scheduled cycle."""
-    logger.info("--- Running Scheduled Cycle at %s ---", time.ctime())
-
-    # 1. Monitor tracked sources
-    logger.info("[Scheduler] Running monitor_sources...")
-    subprocess.run([sys.executable, "-m", "optoagent.cli", "monitor_sources"])
-
-    # 2. Active Search + Idea Generation
-    if query:
-        logger.info("[Scheduler] Running run_cycle for '%s'...", query)
-        subprocess.run(
-            [sys.executable, "-m", "optoagent.cli", "run_cycle", "--query", query, "--limit", "3"]
-        )
+# Per-job outcomes of one cycle
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"
+
+
+class CycleRunner:
+    """Runs the scheduled jobs concurrently against a shared AgentService."""
+
+    def __init__(
+        self,
+        service: Optional[AgentService] = None,
+        query: str | None = DEFAULT_QUERY,
+        limit: int = 3,
+        timeout: float = SCHEDULER_JOB_TIMEOUT,
+    ):
+        self.service = service or AgentService()
+        self.timeout = timeout
+
+        self.jobs: Dict[str, Callable[[], object]] = {
+            "monitor_sources": self.service.monitor_sources,
+        }
+        if query:
+            self.jobs["run_cycle"] = lambda: self.service.run_cycle(query, limit=limit)
+
+        self._inflight: Dict[str, Future] = {}
+
+    def run_once(self) -> Dict[str, str]:
+        """Run one cycle and return the outcome of each job."""
+        logger.info("--- Running Scheduled Cycle at %s ---", time.ctime())
+        results: Dict[str, str] = {}
+        started: Dict[str, Future] = {}
+
+        for name, fn in self.jobs.items():
+            previous = self._inflight.get(name)
+            if previous is not None and not previous.done():
+                logger.warning("[Scheduler] %s is still running from the last cycle, skipping.", name)
+                results[name] = SKIPPED
+                continue
+            logger.info("[Scheduler] Running %s...", name)
+            started[name] = self._inflight[name] = self._start(name, fn)
+
+        wait(started.values(), timeout=self.timeout)
+
+        for name, future in started.items():
+            if not future.done():
+                logger.error("[Scheduler] %s exceeded %.0fs, leaving it to finish in the background.",
+                             name, self.timeout)
+                results[name] = TIMEOUT
+            elif future.exception() is not None:
+                logger.error("[Scheduler] %s failed: %s", name, future.exception())
+                results[name] = FAILED
+            else:
+                results[name] = OK
+
+        logger.info("[Scheduler] Cycle finished: %s", results)
+        return results
+
+    @staticmethod
+    def _start(name: str, fn: Callable[[], object]) -> Future:
+        # Daemon threads rather than an executor: a hung job must not block shutdown
+        future: Future = Future()
+
+        def _target() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_target, name=f"sched-{name}", daemon=True).start()
+        return future
 
 
 def main() -> None:
@@ -45,6 +113,9 @@ def main() -> None:
         help="Time unit for interval",
     )
     parser.add_argument("--query", default=DEFAULT_QUERY, help="Search query for run_cycle")
+    parser.add_argument(
+        "--timeout", type=float, default=SCHEDULER_JOB_TIMEOUT, help="Per-job timeout in seconds"
+    )
     parser.add_argument("--dry-run", action="store_true", help="Run immediately once and exit")
     parser.add_argument(
         "--max-runs", type=int, default=0, help="Stop after N runs (0 = infinite)"
@@ -52,9 +123,11 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    runner = CycleRunner(query=args.query, timeout=args.timeout)
+
     if args.dry_run:
         logger.info("Dry Run: Executing job immediately...")
-        _job(args.query)
+        runner.run_once()
         return
 
     logger.info(
@@ -68,7 +141,7 @@ def main() -> None:
     counter = [0]
 
     def _wrapped_job() -> None:
-        _job(args.query)
+        runner.run_once()
         if args.max_runs > 0:
             counter[0] += 1
             logger.info("Run %d/%d completed.", counter[0], args.max_runs)
@@ -1,42 +1,81 @@
 """
 Flask server for Feishu webhook interactions.
 
-Receives messages from Feishu, dispatches search tasks in background threads.
+Receives messages from Feishu and dispatches search jobs to a bounded
+in-process job queue that runs them against one warm, shared AgentService.
+Replies to the chat are sent off the request thread, so the webhook is
+acknowledged well within Feishu's 3-second deadline.
+
+Run with Flask's development server by default, or with ``--production``
+on waitress, a multi-threaded WSGI server.
 """
 
+import argparse
 import json
 import re
-import subprocess
-import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask, jsonify, request
 
-from optoagent.config import DEFAULT_QUERY
+from optoagent.config import (
+    DEFAULT_QUERY,
+    SERVER_CHANNEL_TIMEOUT,
+    SERVER_CONNECTION_LIMIT,
+    SERVER_DEDUP_TTL,
+    SERVER_HOST,
+    SERVER_JOB_WORKERS,
+    SERVER_MAX_PENDING,
+    SERVER_PORT,
+    SERVER_PRODUCTION,
+    SERVER_THREADS,
+)
+from optoagent.jobs import COALESCED, DUPLICATE, QUEUED, REJECTED, JobQueue
 from optoagent.logger import get_logger
 from optoagent.modules.notifier import FeishuNotifier
+from optoagent.service import AgentService
 
 logger = get_logger(__name__)
 
 app = Flask(__name__)
 notifier = FeishuNotifier()
 
+_service: AgentService | None = None
+_service_lock = threading.Lock()
+_replies = ThreadPoolExecutor(max_workers=4, thread_name_prefix="reply")
+
+
+def get_service() -> AgentService:
+    """Return the process-wide AgentService, building it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            logger.info("Warming up agent service...")
+            _service = AgentService(notifier=notifier)
+        return _service
+
 
 def _run_search(query: str, chat_id: str | None = None) -> None:
-    """Run run_cycle in a background thread to avoid blocking the webhook."""
+    """Run run_cycle on a job worker to avoid blocking the webhook."""
     logger.info("Triggering search for: %s (Chat ID: %s)", query, chat_id)
+    try:
+        new_papers = get_service().run_cycle(query, limit=5, chat_id=chat_id)
+        logger.info("Search finished for '%s': %d new papers.", query, len(new_papers))
+    except Exception:
+        logger.exception("Search job failed for '%s'", query)
 
-    cmd = [sys.executable, "-m", "optoagent.cli", "run_cycle", "--query", query, "--limit", "5"]
-    if chat_id:
-        cmd.extend(["--chat_id", chat_id])
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
-        logger.info("Subprocess Output:\n%s", result.stdout)
-        if result.stderr:
-            logger.warning("Subprocess Error:\n%s", result.stderr)
-    except Exception as e:
-        logger.error("Subprocess failed: %s", e)
+def _reply(text: str, chat_id: str | None) -> None:
+    """Send a chat reply without holding up the webhook response."""
+    _replies.submit(notifier.send_text, text, receive_id=chat_id)
+
+
+jobs = JobQueue(
+    _run_search,
+    workers=SERVER_JOB_WORKERS,
+    max_pending=SERVER_MAX_PENDING,
+    dedup_ttl=SERVER_DEDUP_TTL,
+)
 
 
 @app.route("/feishu_webhook", methods=["POST"])
@@ -57,6 +96,7 @@ def feishu_webhook():
         content = message.get("content", "")
         msg_type = message.get("message_type", "")
         chat_id = message.get("chat_id")
+        delivery_ids = (data["header"].get("event_id"), message.get("message_id"))
 
         logger.info("Message type: %s | Chat ID: %s | Raw content: %s", msg_type, chat_id, content)
 
@@ -74,13 +114,31 @@ def feishu_webhook():
             query = text_content.split(" ", 1)[1] if " " in text_content else DEFAULT_QUERY
             logger.info("Search query extracted: '%s'", query)
 
-            notifier.send_text(
-                f"🔍收到指令：'{query}'\n正在搜索并生成Idea，请稍候...",
-                receive_id=chat_id,
-            )
-
-            thread = threading.Thread(target=_run_search, args=(query, chat_id))
-            thread.start()
+            submission = jobs.submit(query, chat_id, delivery_ids=delivery_ids)
+            logger.info("Job submission for '%s': %s", query, submission.status)
+
+            if submission.status == DUPLICATE:
+                logger.info("Duplicate delivery %s, ignoring.", delivery_ids)
+            elif submission.status == COALESCED:
+                _reply(
+                    f"🔁相同的搜索 '{query}' 正在进行中，结果将一并推送。",
+                    chat_id,
+                )
+            elif submission.status == REJECTED:
+                _reply(
+                    f"⚠️任务队列已满（{submission.position} 个任务等待中），请稍后再试。",
+                    chat_id,
+                )
+            elif submission.status == QUEUED:
+                _reply(
+                    f"🔍收到指令：'{query}'\n任务已排队，当前位置 {submission.position}，请稍候...",
+                    chat_id,
+                )
+            else:
+                _reply(
+                    f"🔍收到指令：'{query}'\n正在搜索并生成Idea，请稍候...",
+                    chat_id,
+                )
         else:
             logger.info("Message did not match search/research pattern, ignoring.")
     else:
@@ -89,9 +147,71 @@ def feishu_webhook():
     return jsonify({"status": "ok"})
 
 
+def create_production_server(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    threads: int = SERVER_THREADS,
+    connection_limit: int = SERVER_CONNECTION_LIMIT,
+    channel_timeout: int = SERVER_CHANNEL_TIMEOUT,
+):
+    """Build (but do not start) a waitress server for the webhook app."""
+    try:
+        from waitress.server import create_server
+    except ImportError:
+        raise SystemExit("Production mode requires waitress: pip install \"optoagent[server]\"")
+
+    return create_server(
+        app,
+        host=host,
+        port=port,
+        threads=threads,
+        connection_limit=connection_limit,
+        channel_timeout=channel_timeout,
+        ident="OptoAgent",
+    )
+
+
 def main() -> None:
-    logger.info("Starting Feishu Interaction Server on port 5000...")
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    parser = argparse.ArgumentParser(description="OptoAgent Feishu Webhook Server")
+    parser.add_argument("--host", default=SERVER_HOST, help="Interface to bind")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to listen on")
+    parser.add_argument(
+        "--production",
+        action="store_true",
+        default=SERVER_PRODUCTION,
+        help="Serve with waitress instead of Flask's development server",
+    )
+    parser.add_argument("--threads", type=int, default=SERVER_THREADS, help="HTTP worker threads (production)")
+    parser.add_argument(
+        "--connection-limit", type=int, default=SERVER_CONNECTION_LIMIT, help="Max open connections (production)"
+    )
+    parser.add_argument(
+        "--channel-timeout",
+        type=int,
+        default=SERVER_CHANNEL_TIMEOUT,
+        help="Seconds before an idle keep-alive or stalled connection is closed (production)",
+    )
+    args = parser.parse_args()
+
+    # Build the heavy components before the first webhook arrives
+    get_service()
+
+    if args.production:
+        server = create_production_server(
+            host=args.host,
+            port=args.port,
+            threads=args.threads,
+            connection_limit=args.connection_limit,
+            channel_timeout=args.channel_timeout,
+        )
+        logger.info(
+            "Starting Feishu Interaction Server (waitress, %d threads) on %s:%d...",
+            args.threads, args.host, args.port,
+        )
+        server.run()
+    else:
+        logger.info("Starting Feishu Interaction Server (development) on port %d...", args.port)
+        app.run(host=args.host, port=args.port, debug=True, use_reloader=False)
 
 
 if __name__ == "__main__":
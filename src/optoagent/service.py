@@ -0,0 +1,153 @@
+"""
+Long-lived agent service shared by the CLI, the webhook server and the scheduler.
+
+Holds one warm instance of every component (storage, searcher, summarizer,
+vector store, notifier, idea generator) and implements the
+search → dedup → summarize → store → notify → idea pipeline on top of them.
+Stored papers are also embedded into a similarity index, so ideas can draw
+on related older papers from the library.
+All components are safe to share between worker threads; in particular
+Storage serializes every write, so concurrent jobs (the scheduler runs
+monitor_sources and run_cycle side by side) can store papers and ideas at
+the same time.
+"""
+
+from typing import List, Optional
+
+from optoagent.config import DEFAULT_QUERY, EXA_API_KEY, RAG_RELATED_PAPERS
+from optoagent.identifiers import title_fingerprint
+from optoagent.logger import get_logger
+from optoagent.models import Paper
+from optoagent.modules.idea_generator import IdeaGenerator
+from optoagent.modules.notifier import FeishuNotifier
+from optoagent.modules.searcher import PaperSearcher
+from optoagent.modules.storage import Storage
+from optoagent.modules.summarizer import PaperSummarizer
+from optoagent.modules.vector_store import VectorStore
+
+logger = get_logger(__name__)
+
+
+class AgentService:
+    """Warm agent components plus the paper processing pipeline."""
+
+    def __init__(
+        self,
+        storage: Optional[Storage] = None,
+        searcher: Optional[PaperSearcher] = None,
+        summarizer: Optional[PaperSummarizer] = None,
+        vector_store: Optional[VectorStore] = None,
+        notifier: Optional[FeishuNotifier] = None,
+        idea_generator: Optional[IdeaGenerator] = None,
+    ):
+        self.storage = storage or Storage()
+        self.searcher = searcher or PaperSearcher(exa_api_key=EXA_API_KEY)
+        self.summarizer = summarizer or PaperSummarizer()
+        self.vector_store = vector_store or VectorStore()
+        self.notifier = notifier or FeishuNotifier()
+        self.idea_generator = idea_generator or IdeaGenerator()
+
+    # ---- Commands ----
+
+    def active_search(self, query: str | None = None, limit: int = 5, chat_id: str | None = None) -> List[Paper]:
+        papers = self.searcher.search_active(query or DEFAULT_QUERY, limit=limit)
+        return self.process_papers(papers, chat_id=chat_id)
+
+    def run_cycle(self, query: str | None = None, limit: int = 5, chat_id: str | None = None) -> List[Paper]:
+        new_papers = self.active_search(query, limit=limit, chat_id=chat_id)
+        self.generate_idea(new_papers, chat_id=chat_id)
+        return new_papers
+
+    def monitor_sources(self, chat_id: str | None = None) -> List[Paper]:
+        logger.info("Monitoring tracked sources (Journals & Groups)...")
+        papers = self.searcher.monitor_sources()
+        if not papers:
+            logger.info("No new papers found from tracked sources.")
+        try:
+            new_papers = self.process_papers(papers, chat_id=chat_id)
+        except BaseException:
+            self.searcher.discard_feed_state()
+            raise
+        # Feeds are only marked as read once their entries are stored
+        self.searcher.commit_feed_state()
+        if new_papers:
+            self.generate_idea(new_papers, chat_id=chat_id)
+        return new_papers
+
+    # ---- Pipeline steps ----
+
+    def process_papers(self, papers: List[Paper], chat_id: str | None = None) -> List[Paper]:
+        """Dedup → Summarize → Store → Notify. Returns the papers actually added."""
+        candidates = self.storage.filter_new(papers)
+        skipped = len(papers) - len(candidates)
+        if skipped:
+            logger.info("Skipped %d papers already in the library.", skipped)
+
+        if candidates:
+            logger.info("Summarizing %d new papers...", len(candidates))
+        for p, summary in zip(candidates, self.summarizer.summarize_many(candidates)):
+            p.summary = summary
+
+        new_papers = self.storage.add_papers(candidates)
+        for p in new_papers:
+            self.notifier.notify_new_paper(p, receive_id=chat_id)
+        if new_papers:
+            self.index_papers()
+
+        if not new_papers:
+            logger.info("No new papers found during this cycle.")
+        return new_papers
+
+    def index_papers(self) -> None:
+        """Bring the paper similarity index up to date (failures only cost freshness)."""
+        try:
+            self.vector_store.index_papers(self.storage)
+        except Exception as e:
+            logger.warning("Paper index update failed: %s", e)
+
+    def related_papers(
+        self,
+        query: str | List[str],
+        limit: int = 5,
+        exclude: Optional[List[Paper]] = None,
+    ) -> List[Paper]:
+        """Stored papers most similar to ``query``, best first, leaving out ``exclude``."""
+        exclude = exclude or []
+        skip = {title_fingerprint(p.title) for p in exclude}
+        hits = self.vector_store.related_papers(query, n_results=limit + len(exclude))
+        found = self.storage.get_papers_by_ids([h["id"] for h in hits])
+        related = [
+            found[h["id"]] for h in hits
+            if h["id"] in found and title_fingerprint(found[h["id"]].title) not in skip
+        ]
+        return related[:limit]
+
+    def generate_idea(self, new_papers: List[Paper], chat_id: str | None = None) -> None:
+        """Generate, store and announce one idea from the new (or most recent) papers."""
+        experiments = self.storage.get_experiments()
+        papers = new_papers or self.storage.get_recent_papers(5)
+
+        if not papers:
+            logger.info("Not enough papers to generate ideas.")
+            return
+
+        queries = [f"{p.title} {p.summary or ''}" for p in papers]
+
+        # RAG: one batched retrieval covering every new paper
+        context = ""
+        if new_papers:
+            logger.info("Retrieving context for %d new papers...", len(new_papers))
+            context = self.vector_store.query_similar_context(queries)
+
+        related: List[Paper] = []
+        if RAG_RELATED_PAPERS:
+            try:
+                related = self.related_papers(queries, limit=RAG_RELATED_PAPERS, exclude=papers)
+            except Exception as e:
+                logger.warning("Related paper lookup failed: %s", e)
+
+        idea = self.idea_generator.generate_idea(papers, experiments, context, related_papers=related)
+
+        self.storage.add_idea(idea)
+        self.notifier.notify_new_idea(idea, receive_id=chat_id)
+        logger.info("Generated new idea: %s", idea.title)
@@ -52,3 +52,43 @@ def sample_idea():
         reasoning="QDs provide tunable absorption, perovskites offer high efficiency.",
         source_papers=["Paper A", "Paper B"],
     )
+
+
+@pytest.fixture
+def embedding_function():
+    """Deterministic bag-of-words embedding function (no model download)."""
+    pytest.importorskip("chromadb")
+    import hashlib
+
+    import numpy as np
+    from chromadb.api.types import EmbeddingFunction
+
+    class HashEmbeddingFunction(EmbeddingFunction):
+        def __init__(self):
+            self.calls = 0
+            self.texts = 0
+
+        def __call__(self, input):
+            self.calls += 1
+            self.texts += len(input)
+            vectors = []
+            for text in input:
+                v = np.zeros(64, dtype=np.float32)
+                for word in text.lower().split():
+                    v[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+                norm = np.linalg.norm(v)
+                vectors.append(v / norm if norm else v)
+            return vectors
+
+        @staticmethod
+        def name():
+            return "test-hash"
+
+        def get_config(self):
+            return {}
+
+        @staticmethod
+        def build_from_config(config):
+            return HashEmbeddingFunction()
+
+    return HashEmbeddingFunction()
@@ -0,0 +1,75 @@
+"""
+Tests for the structure-aware chunker.
+"""
+
+from optoagent.modules.chunker import chunk_id, chunk_text
+
+
+class TestChunkText:
+    def test_short_text_is_one_chunk(self):
+        assert chunk_text("A short note.") == ["A short note."]
+
+    def test_small_sections_share_a_chunk(self):
+        text = "# A\nFirst.\n\n# B\nSecond."
+
+        assert chunk_text(text, chunk_size=100) == ["# A\nFirst.\n\n# B\nSecond."]
+
+    def test_splits_at_headings(self):
+        text = "# Intro\n" + "intro words " * 10 + "\n\n# Methods\n" + "method words " * 10
+
+        chunks = chunk_text(text, chunk_size=200, overlap=0)
+
+        assert len(chunks) == 2
+        assert chunks[0].startswith("# Intro")
+        assert chunks[1].startswith("# Methods")
+
+    def test_long_section_splits_on_sentences_with_overlap(self):
+        sentences = [f"Sentence number {i} talks about quantum dots." for i in range(40)]
+        text = " ".join(sentences)
+
+        chunks = chunk_text(text, chunk_size=300, overlap=60)
+
+        assert len(chunks) > 1
+        assert all(len(c) <= 300 for c in chunks)
+        for prev, nxt in zip(chunks, chunks[1:]):
+            head = nxt.split(" Sentence number")[0]
+            assert head and head in prev
+        # Every sentence survives intact in some chunk
+        for s in sentences:
+            assert any(s in c for c in chunks)
+
+    def test_chinese_sentences(self):
+        text = "量子点光谱仪的标定方法。" * 60
+
+        chunks = chunk_text(text, chunk_size=200, overlap=20)
+
+        assert all(len(c) <= 200 for c in chunks)
+        assert all(c.rstrip().endswith("。") for c in chunks)
+
+    def test_unbroken_text_is_hard_split(self):
+        chunks = chunk_text("x" * 2500, chunk_size=1000, overlap=150)
+
+        assert len(chunks) == 3
+        assert all(len(c) <= 1000 for c in chunks)
+
+    def test_tiny_chunk_size_terminates(self):
+        chunks = chunk_text("abcdefghij" * 3, chunk_size=2, overlap=1)
+
+        assert chunks[0] == "a" and chunks[-1].endswith("j")
+        assert all(len(c) <= 3 for c in chunks)
+
+
+class TestChunkId:
+    def test_depends_on_path_and_content(self):
+        assert chunk_id("a/note.md", "text") == chunk_id("a/note.md", "text")
+        assert chunk_id("a/note.md", "text") != chunk_id("b/note.md", "text")
+        assert chunk_id("a/note.md", "text") != chunk_id("a/note.md", "text!")
+
+    def test_local_edit_keeps_other_chunk_ids(self):
+        sections = [f"# Section {i}\n" + f"Content of section {i}. " * 30 for i in range(5)]
+        before = chunk_text("\n\n".join(sections), chunk_size=800)
+        sections[3] = sections[3].replace("Content of section 3.", "Edited section 3.", 1)
+        after = chunk_text("\n\n".join(sections), chunk_size=800)
+
+        unchanged = {chunk_id("n.md", c) for c in before} & {chunk_id("n.md", c) for c in after}
+        assert len(unchanged) == len(before) - 1
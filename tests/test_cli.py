@@ -0,0 +1,49 @@
+"""
+Startup-time checks for the CLI entry point (``python -X importtime``).
+"""
+
+import subprocess
+import sys
+
+# Imports that storage-only commands must never pay for
+HEAVY_MODULES = ("openai", "feedparser", "requests", "chromadb")
+
+
+def _importtime(command, data_dir):
+    """Run an optoagent command under -X importtime; return {module: cumulative µs}."""
+    script = (
+        "import sys, optoagent.config as c; "
+        f"c.DATA_DIR = {str(data_dir)!r}; "
+        f"sys.argv = ['optoagent', {command!r}]; "
+        "from optoagent.cli import main; main()"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+class TestCliStartup:
+    def test_list_papers_skips_heavy_imports(self, tmp_data_dir):
+        timings = _importtime("list_papers", tmp_data_dir)
+
+        loaded = {name.split(".")[0] for name in timings}
+        assert not loaded & set(HEAVY_MODULES)
+
+    def test_list_papers_import_budget(self, tmp_data_dir):
+        timings = _importtime("list_papers", tmp_data_dir)
+
+        # Generous bound; importing the eager CLI took ~0.7 s (now ~45 ms)
+        assert timings["optoagent.cli"] < 500_000
@@ -0,0 +1,149 @@
+"""
+Tests for near-duplicate paper detection.
+"""
+
+import sqlite3
+import time
+
+from optoagent.models import Paper
+from optoagent.modules.dedup import NearDuplicateIndex, minhash, paper_text, similarity
+from optoagent.modules.storage import Storage
+
+ABSTRACT = (
+    "We report a perovskite photodetector with a responsivity of 1.2 A/W and a "
+    "response time below 50 ns. The device combines a graded bandgap absorber "
+    "with a transparent electrode, suppressing dark current by two orders of "
+    "magnitude compared with planar reference devices."
+)
+REWORDED = (
+    "We report a perovskite photodetector with a responsivity of 1.2 A/W and a "
+    "response time below 50 ns. The device combines a graded bandgap absorber "
+    "with a transparent electrode, suppressing the dark current by two orders of "
+    "magnitude compared with planar devices."
+)
+
+
+def _paper(title, abstract=ABSTRACT, url="https://example.com/a"):
+    return Paper(title=title, authors=["Alice"], abstract=abstract, url=url)
+
+
+class TestMinHash:
+    def test_identical_texts_match(self):
+        a = minhash(paper_text("Fast perovskite photodetectors", ABSTRACT))
+        b = minhash(paper_text("[Nature Photonics] Fast perovskite photodetectors", ABSTRACT))
+        assert similarity(a, b) == 1.0
+
+    def test_reworded_text_is_similar_and_unrelated_is_not(self):
+        a = minhash(paper_text("Fast perovskite photodetectors", ABSTRACT))
+        b = minhash(paper_text("Fast perovskite photodetectors with graded absorbers", REWORDED))
+        c = minhash(paper_text("Thermal tuning of silicon ring resonators", "Rings are tuned by heaters."))
+        assert similarity(a, b) >= 0.7
+        assert similarity(a, c) < 0.2
+
+    def test_empty_text_has_no_signature(self):
+        assert minhash("  ... ") is None
+
+    def test_index_find(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add(1, minhash(paper_text("Fast perovskite photodetectors", ABSTRACT)))
+        index.add(2, minhash("Thermal tuning of silicon ring resonators"))
+
+        key, score = index.find(minhash(paper_text("Fast perovskite photodetectors", REWORDED)))
+        assert key == 1 and score >= 0.7
+        assert index.find(minhash("Lithium niobate modulators on insulator")) is None
+        assert len(index) == 2
+
+
+class TestStorageNearDuplicates:
+    def test_group_prefix_and_punctuation(self, tmp_data_dir):
+        storage = Storage(data_dir=tmp_data_dir, near_duplicate_threshold=None)
+        storage.add_paper(_paper("Fast perovskite photodetectors"))
+        storage.add_paper(
+            _paper("[Smith Group] Fast perovskite photodetectors.", abstract="", url="https://example.com/b")
+        )
+        assert storage.count_papers() == 1
+
+    def test_preprint_with_reworded_title(self, tmp_data_dir):
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_paper(_paper("Fast perovskite photodetectors", url="https://arxiv.org/abs/2401.00001"))
+
+        preprint = _paper(
+            "Fast perovskite photodetectors with graded absorbers",
+            abstract=REWORDED,
+            url="https://www.nature.com/articles/s41566-024-00001-1",
+        )
+        unrelated = _paper(
+            "Thermal tuning of silicon ring resonators",
+            abstract="Integrated heaters tune silicon microring resonances across a full free spectral range.",
+            url="https://example.com/rings",
+        )
+
+        assert storage.has_paper(preprint)
+        assert storage.filter_new([preprint, unrelated]) == [unrelated]
+        storage.add_paper(preprint)
+        assert storage.count_papers() == 1
+
+        # Disabled: only exact keys count
+        storage.close()
+        exact_only = Storage(data_dir=tmp_data_dir, near_duplicate_threshold=0)
+        exact_only.add_paper(preprint)
+        assert exact_only.count_papers() == 2
+
+    def test_duplicates_within_batch(self, tmp_data_dir):
+        storage = Storage(data_dir=tmp_data_dir)
+        batch = [
+            _paper("Fast perovskite photodetectors", url="https://example.com/1"),
+            _paper("Fast perovskite photodetectors with graded absorbers", REWORDED, "https://example.com/2"),
+        ]
+        assert storage.filter_new(batch) == batch[:1]
+
+    def test_signatures_survive_reopen(self, tmp_data_dir):
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_paper(_paper("Fast perovskite photodetectors"))
+        storage.close()
+
+        reopened = Storage(data_dir=tmp_data_dir)
+        assert reopened.has_paper(_paper("A new title", abstract=REWORDED, url="https://example.com/z"))
+
+    def test_migrates_legacy_database(self, tmp_data_dir):
+        import os
+
+        os.makedirs(tmp_data_dir, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(tmp_data_dir, "papers.db"))
+        conn.executescript(
+            """
+            CREATE TABLE papers (id INTEGER PRIMARY KEY AUTOINCREMENT, title_key TEXT NOT NULL,
+                                 doi TEXT, url_key TEXT, data TEXT NOT NULL);
+            CREATE UNIQUE INDEX idx_papers_title ON papers(title_key);
+            """
+        )
+        conn.execute(
+            "INSERT INTO papers (title_key, data) VALUES (?, ?)",
+            (
+                "[smith group] fast perovskite photodetectors",
+                '{"title": "[Smith Group] Fast perovskite photodetectors", "authors": [], '
+                '"abstract": "%s", "url": ""}' % ABSTRACT,
+            ),
+        )
+        conn.commit()
+        conn.close()
+
+        storage = Storage(data_dir=tmp_data_dir, migrate_legacy=False)
+        assert storage.has_paper(_paper("Fast perovskite photodetectors!", abstract="", url=""))
+        assert storage.has_paper(_paper("Another title", abstract=REWORDED, url=""))
+        assert storage.count_papers() == 1
+
+    def test_lookup_is_fast(self, tmp_data_dir):
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_papers([
+            _paper(f"Paper {i} on topic {i * 7}", abstract=f"Abstract number {i} about sample {i * 13}.",
+                   url=f"https://example.com/{i}")
+            for i in range(2000)
+        ])
+        probe = _paper("Unseen paper", abstract="Completely different words here.", url="https://example.com/x")
+        storage.has_paper(probe)
+
+        start = time.perf_counter()
+        for _ in range(50):
+            storage.has_paper(probe)
+        assert (time.perf_counter() - start) / 50 < 0.01
@@ -0,0 +1,92 @@
+"""
+Tests for knowledge-base text extraction (process pool, per-file timeout).
+"""
+
+import time
+
+import pytest
+
+from optoagent.modules import document_reader
+from optoagent.modules.document_reader import extract_pdf_text, iter_documents
+
+
+def _write_pdf(path, text):
+    """Write a minimal one-page PDF containing ``text``."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+class TestExtractPdfText:
+    def test_extracts_text(self, tmp_path):
+        path = str(tmp_path / "a.pdf")
+        _write_pdf(path, "Quantum dot spectrometer")
+
+        assert "Quantum dot spectrometer" in extract_pdf_text(path)
+
+    def test_timeout_interrupts_slow_page(self, tmp_path, monkeypatch):
+        pypdf = pytest.importorskip("pypdf")
+
+        class _SlowPage:
+            def extract_text(self):
+                time.sleep(5)
+                return ""
+
+        class _SlowReader:
+            def __init__(self, path):
+                self.pages = [_SlowPage()]
+
+        monkeypatch.setattr(pypdf, "PdfReader", _SlowReader)
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            extract_pdf_text(str(tmp_path / "slow.pdf"), timeout=0.2)
+        assert time.monotonic() - start < 2
+
+
+class TestIterDocuments:
+    def test_streams_text_and_pdfs(self, tmp_path):
+        paths = []
+        for i in range(3):
+            path = str(tmp_path / f"paper{i}.pdf")
+            _write_pdf(path, f"Paper number {i}")
+            paths.append(path)
+        broken = str(tmp_path / "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"not a pdf")
+        note = str(tmp_path / "note.md")
+        with open(note, "w", encoding="utf-8") as f:
+            f.write("A markdown note.")
+
+        results = dict(iter_documents(paths + [broken, note], max_workers=2, timeout=30))
+
+        assert results[note] == "A markdown note."
+        assert results[broken] is None
+        for i, path in enumerate(paths):
+            assert f"Paper number {i}" in results[path]
+
+    def test_text_only_needs_no_pool(self, tmp_path, monkeypatch):
+        note = str(tmp_path / "note.txt")
+        with open(note, "w", encoding="gbk") as f:
+            f.write("量子点光谱仪")
+        monkeypatch.setattr(document_reader, "ProcessPoolExecutor", None)
+
+        assert list(iter_documents([note])) == [(note, "量子点光谱仪")]
@@ -0,0 +1,111 @@
+"""
+Tests for the memory-mapped embedding cache and the NumPy vector index.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from optoagent.modules.embedding_cache import EmbeddingCache
+from optoagent.modules.numpy_index import NumpyVectorIndex
+
+
+def _fake_embed(texts):
+    _fake_embed.calls.append(list(texts))
+    return [np.full(4, len(t), dtype=np.float32) for t in texts]
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    _fake_embed.calls = []
+
+
+class TestEmbeddingCache:
+    def test_embeds_each_distinct_text_once(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+
+        first = cache.embed(["a", "bb", "a"], _fake_embed, model="m")
+        second = cache.embed(["bb", "ccc"], _fake_embed, model="m")
+
+        assert _fake_embed.calls == [["a", "bb"], ["ccc"]]
+        assert [v[0] for v in first] == [1, 2, 1]
+        assert [v[0] for v in second] == [2, 3]
+
+    def test_persists_across_instances(self, tmp_path):
+        EmbeddingCache(str(tmp_path)).embed(["a", "bb"], _fake_embed, model="m")
+
+        reopened = EmbeddingCache(str(tmp_path))
+        vectors = reopened.embed(["bb", "a"], _fake_embed, model="m")
+
+        assert len(_fake_embed.calls) == 1
+        assert [v[0] for v in vectors] == [2, 1]
+
+    def test_keys_include_model(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path))
+        cache.embed(["a"], _fake_embed, model="m1")
+        cache.embed(["a"], _fake_embed, model="m2")
+
+        assert len(_fake_embed.calls) == 2
+
+    def test_recovers_from_torn_write(self, tmp_path):
+        EmbeddingCache(str(tmp_path)).embed(["a", "bb"], _fake_embed, model="m")
+        # Simulate a crash after the vector append but before the key append
+        with open(os.path.join(str(tmp_path), "vectors.f32"), "ab") as f:
+            f.write(np.ones(4, dtype=np.float32).tobytes())
+
+        cache = EmbeddingCache(str(tmp_path))
+        cache.embed(["ccc"], _fake_embed, model="m")
+
+        assert cache.stats()["entries"] == 3
+        assert [v[0] for v in EmbeddingCache(str(tmp_path)).embed(["ccc", "a"], _fake_embed, model="m")] == [3, 1]
+
+    def test_instances_sharing_a_directory(self, tmp_path):
+        # e.g. the scheduler and the web server, each with its own view of the cache
+        a = EmbeddingCache(str(tmp_path))
+        b = EmbeddingCache(str(tmp_path))
+        a.put(["shared"], [np.zeros(4)])
+        b.get(["shared"])
+
+        a.put(["ka"], [np.ones(4)])
+        b.put(["kb"], [np.full(4, 2.0)])
+        b.put(["ka"], [np.full(4, 9.0)])
+
+        assert b.get(["kb"])[0][0] == 2 and b.get(["ka"])[0][0] == 1
+        assert a.get(["kb"])[0][0] == 2
+        fresh = EmbeddingCache(str(tmp_path))
+        assert [v[0] for v in fresh.get(["ka", "kb", "shared"])] == [1, 2, 0]
+        assert fresh.stats()["entries"] == 3
+
+
+class TestNumpyVectorIndex:
+    def test_matches_brute_force(self, tmp_path):
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(200, 8)).astype(np.float32)
+        index = NumpyVectorIndex(str(tmp_path / "idx.db"))
+        index.upsert(
+            ids=[f"c{i}" for i in range(200)],
+            documents=[f"doc {i}" for i in range(200)],
+            metadatas=[{"source": f"s{i}"} for i in range(200)],
+            embeddings=vectors,
+        )
+        queries = rng.normal(size=(3, 8)).astype(np.float32)
+
+        result = index.query(query_embeddings=queries, n_results=5)
+
+        for qi, q in enumerate(queries):
+            expected = np.argsort(((vectors - q) ** 2).sum(axis=1))[:5]
+            assert result["ids"][qi] == [f"c{i}" for i in expected]
+            assert result["metadatas"][qi][0] == {"source": f"s{expected[0]}"}
+
+    def test_delete_and_persist(self, tmp_path):
+        path = str(tmp_path / "idx.db")
+        index = NumpyVectorIndex(path)
+        index.upsert(ids=["a", "b"], documents=["A", "B"], metadatas=[{}, {}],
+                     embeddings=[[1.0, 0.0], [0.0, 1.0]])
+        index.query(query_embeddings=[[1.0, 0.0]], n_results=1)
+        index.delete(ids=["a"])
+
+        reopened = NumpyVectorIndex(path)
+        assert reopened.count() == 1
+        assert reopened.query(query_embeddings=[[1.0, 0.0]], n_results=2)["ids"] == [["b"]]
@@ -0,0 +1,152 @@
+"""
+Tests for the concurrent RSS FeedFetcher (no network).
+"""
+
+import threading
+import time
+
+import pytest
+
+from optoagent.modules.feed_fetcher import FeedFetcher, FeedStateCache
+
+RSS_TEMPLATE = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{name}</title>
+<item><title>Paper from {name}</title><link>https://{name}/a1</link><guid>{name}-a1</guid></item>
+</channel></rss>"""
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    """Sleeps per request and tracks peak concurrency per host."""
+
+    def __init__(self, delay: float = 0.2, fail_hosts=()):
+        self.delay = delay
+        self.fail_hosts = set(fail_hosts)
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None):
+        host = url.split("/")[2]
+        with self._lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            time.sleep(self.delay)
+            if host in self.fail_hosts:
+                return _FakeResponse(b"", status_code=503)
+            return _FakeResponse(RSS_TEMPLATE.format(name=host).encode())
+        finally:
+            with self._lock:
+                self.active[host] -= 1
+
+
+class _ConditionalSession:
+    """Serves a fixed feed with an ETag and honours If-None-Match."""
+
+    def __init__(self, body: str, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return _FakeResponse(b"", status_code=304)
+        return _FakeResponse(self.body.encode(), headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def feed_state(tmp_path):
+    return FeedStateCache(path=str(tmp_path / "feed_state.json"))
+
+
+class TestFeedFetcher:
+    def test_results_in_input_order(self, feed_state):
+        urls = [f"https://host{i}.org/rss" for i in range(6)]
+        fetcher = FeedFetcher(max_workers=6, per_host=2, timeout=5, session=_FakeSession(delay=0.05), state=feed_state)
+
+        results = fetcher.fetch_all(urls)
+
+        assert [u for u, _ in results] == urls
+        assert [entries[0].title for _, entries in results] == [f"Paper from host{i}.org" for i in range(6)]
+
+    def test_fetches_run_concurrently(self, feed_state):
+        urls = [f"https://host{i}.org/rss" for i in range(8)]
+        fetcher = FeedFetcher(max_workers=8, per_host=2, timeout=5, session=_FakeSession(delay=0.2), state=feed_state)
+
+        start = time.monotonic()
+        fetcher.fetch_all(urls)
+
+        assert time.monotonic() - start < 0.2 * len(urls) / 2
+
+    def test_per_host_limit(self, feed_state):
+        session = _FakeSession(delay=0.05)
+        urls = [f"https://same.org/rss{i}" for i in range(6)]
+        fetcher = FeedFetcher(max_workers=6, per_host=2, timeout=5, session=session, state=feed_state)
+
+        fetcher.fetch_all(urls)
+
+        assert session.peak["same.org"] <= 2
+
+    def test_failed_feed_returns_none(self, feed_state):
+        session = _FakeSession(delay=0.01, fail_hosts={"bad.org"})
+        fetcher = FeedFetcher(max_workers=2, per_host=1, timeout=5, session=session, state=feed_state)
+
+        results = dict(fetcher.fetch_all(["https://bad.org/rss", "https://good.org/rss"]))
+
+        assert results["https://bad.org/rss"] is None
+        assert len(results["https://good.org/rss"]) == 1
+
+    def test_conditional_get_skips_unchanged_feed(self, tmp_path):
+        session = _ConditionalSession(RSS_TEMPLATE.format(name="cond.org"))
+        state_path = str(tmp_path / "feed_state.json")
+        url = "https://cond.org/rss"
+
+        fetcher = FeedFetcher(session=session, state=FeedStateCache(state_path))
+        first = fetcher.fetch_all([url])
+        fetcher.commit_state()
+        # New process: state is reloaded from disk
+        second = FeedFetcher(session=session, state=FeedStateCache(state_path)).fetch_all([url])
+
+        assert len(first[0][1]) == 1
+        assert second[0][1] == []
+        assert session.requests[1]["If-None-Match"] == '"v1"'
+
+    def test_only_unseen_entries_returned(self, feed_state):
+        url = "https://seen.org/rss"
+        first = FeedFetcher(session=_ConditionalSession(RSS_TEMPLATE.format(name="seen.org"), etag='"a"'), state=feed_state)
+        first.fetch_all([url])
+        first.commit_state()
+
+        updated = RSS_TEMPLATE.format(name="seen.org").replace(
+            "<item>", "<item><title>Newer</title><link>https://seen.org/a2</link><guid>seen.org-a2</guid></item><item>", 1
+        )
+        second = FeedFetcher(session=_ConditionalSession(updated, etag='"b"'), state=feed_state)
+        entries = second.fetch_all([url])[0][1]
+
+        assert [e.title for e in entries] == ["Newer"]
+
+    def test_uncommitted_state_is_not_saved(self, tmp_path):
+        session = _ConditionalSession(RSS_TEMPLATE.format(name="crash.org"))
+        state_path = str(tmp_path / "feed_state.json")
+        url = "https://crash.org/rss"
+
+        fetcher = FeedFetcher(session=session, state=FeedStateCache(state_path))
+        assert len(fetcher.fetch_all([url])[0][1]) == 1
+        # Entries were never stored: the same process and a new one both see them again
+        assert len(fetcher.fetch_all([url])[0][1]) == 1
+        fetcher.discard_state()
+        restarted = FeedFetcher(session=session, state=FeedStateCache(state_path))
+        assert len(restarted.fetch_all([url])[0][1]) == 1
+        assert "If-None-Match" not in session.requests[-1]
@@ -0,0 +1,84 @@
+"""
+Tests for the bounded webhook JobQueue.
+"""
+
+import threading
+
+from optoagent.jobs import COALESCED, DUPLICATE, QUEUED, REJECTED, STARTED, JobQueue
+
+
+class _BlockingHandler:
+    """Records calls and blocks each job until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, query, chat_id):
+        self.calls.append((query, chat_id))
+        self.release.wait(timeout=5)
+
+
+class TestJobQueue:
+    def test_backpressure_positions_and_rejection(self):
+        handler = _BlockingHandler()
+        jobs = JobQueue(handler, workers=1, max_pending=2)
+
+        assert jobs.submit("a").status == STARTED
+        second = jobs.submit("b")
+        third = jobs.submit("c")
+        fourth = jobs.submit("d")
+
+        handler.release.set()
+        assert jobs.join(timeout=5)
+
+        assert (second.status, second.position) == (QUEUED, 1)
+        assert (third.status, third.position) == (QUEUED, 2)
+        assert fourth.status == REJECTED
+        assert [q for q, _ in handler.calls] == ["a", "b", "c"]
+
+    def test_identical_inflight_query_is_coalesced(self):
+        handler = _BlockingHandler()
+        jobs = JobQueue(handler, workers=1, max_pending=5)
+
+        assert jobs.submit("Perovskite  LED", chat_id="c1").status == STARTED
+        assert jobs.submit("perovskite led", chat_id="c1").status == COALESCED
+        # Same query from another chat is a separate job
+        assert jobs.submit("perovskite led", chat_id="c2").status == QUEUED
+
+        handler.release.set()
+        assert jobs.join(timeout=5)
+        assert len(handler.calls) == 2
+
+        # Once finished, the same query can run again
+        assert jobs.submit("perovskite led", chat_id="c1").status == STARTED
+        assert jobs.join(timeout=5)
+
+    def test_duplicate_delivery_ids_dropped(self):
+        handler = _BlockingHandler()
+        handler.release.set()
+        jobs = JobQueue(handler, workers=2, max_pending=5)
+
+        assert jobs.submit("q1", delivery_ids=("ev_1", "om_1")).status == STARTED
+        assert jobs.join(timeout=5)
+        # Redelivery of the same message under a new event_id
+        assert jobs.submit("q1", delivery_ids=("ev_2", "om_1")).status == DUPLICATE
+        assert jobs.submit("q1", delivery_ids=(None, None)).status == STARTED
+        assert jobs.join(timeout=5)
+
+        assert len(handler.calls) == 2
+
+    def test_handler_errors_do_not_kill_workers(self):
+        calls = []
+
+        def handler(query, chat_id):
+            calls.append(query)
+            if query == "boom":
+                raise RuntimeError("fail")
+
+        jobs = JobQueue(handler, workers=1, max_pending=5)
+        jobs.submit("boom")
+        jobs.submit("ok")
+
+        assert jobs.join(timeout=5)
+        assert calls == ["boom", "ok"]
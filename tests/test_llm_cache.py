@@ -0,0 +1,46 @@
+"""
+Tests for the content-addressed LLM response cache.
+"""
+
+from optoagent.modules.llm_cache import LLMCache
+
+
+class TestLLMCache:
+    def test_key_depends_on_model_template_and_inputs(self):
+        base = LLMCache.make_key("gpt-4o", "summary-v1", {"title": "t"})
+
+        assert base == LLMCache.make_key("gpt-4o", "summary-v1", {"title": "t"})
+        assert base != LLMCache.make_key("gpt-4o-mini", "summary-v1", {"title": "t"})
+        assert base != LLMCache.make_key("gpt-4o", "summary-v2", {"title": "t"})
+        assert base != LLMCache.make_key("gpt-4o", "summary-v1", {"title": "u"})
+
+    def test_hit_miss_counters(self, tmp_path):
+        cache = LLMCache(path=str(tmp_path / "llm.db"))
+
+        assert cache.get("k") is None
+        cache.put("k", "value")
+
+        assert cache.get("k") == "value"
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+    def test_lru_eviction(self, tmp_path):
+        import time
+
+        cache = LLMCache(path=str(tmp_path / "llm.db"), max_entries=2)
+        cache.put("a", "1")
+        time.sleep(0.01)
+        cache.put("b", "2")
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.put("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1" and cache.get("c") == "3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "llm.db")
+        LLMCache(path=path).put("k", "v")
+
+        assert LLMCache(path=path).get("k") == "v"
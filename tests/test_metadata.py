@@ -0,0 +1,203 @@
+"""
+Tests for MetadataEnricher and its persistent cache (no network).
+"""
+
+import pytest
+
+from optoagent.modules.metadata import MetadataEnricher
+from optoagent.modules.metadata_cache import MetadataCache
+
+HIT = {"authors": ["Alice"], "abstract": "A" * 80, "enriched": True, "source": "semantic_scholar_doi"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MetadataCache(path=str(tmp_path / "metadata_cache.db"), ttl=3600, negative_ttl=60)
+
+
+class TestMetadataCache:
+    def test_repeat_lookup_served_from_cache(self, cache, monkeypatch):
+        enricher = MetadataEnricher(cache=cache)
+        calls = []
+        monkeypatch.setattr(enricher, "_lookup", lambda doi, title: calls.append(doi) or HIT)
+
+        url = "https://www.nature.com/articles/s41566-024-01234-5"
+        first = enricher.enrich_paper("Some Title", url, [], "")
+        # Same paper via a research-group search: prefixed title, same DOI
+        second = MetadataEnricher(cache=cache).enrich_paper("[Nature] Some Title", url, [], "")
+
+        assert first == second == HIT
+        assert calls == ["10.1038/s41566-024-01234-5"]
+
+    def test_title_key_ignores_group_prefix_and_punctuation(self):
+        assert MetadataEnricher._cache_keys(None, "[Group] Hello, World!") == \
+            MetadataEnricher._cache_keys(None, "hello world")
+
+    def test_same_title_different_doi_not_shared(self, cache, monkeypatch):
+        enricher = MetadataEnricher(cache=cache)
+        calls = []
+        other = dict(HIT, authors=["Bob"])
+        monkeypatch.setattr(enricher, "_lookup", lambda doi, title: calls.append(doi) or (HIT if doi.endswith("aaa") else other))
+
+        first = enricher.enrich_paper("Editorial", "https://doi.org/10.1000/aaa", [], "")
+        second = enricher.enrich_paper("Editorial", "https://doi.org/10.1000/bbb", [], "")
+
+        assert first["authors"] == ["Alice"] and second["authors"] == ["Bob"]
+        assert calls == ["10.1000/aaa", "10.1000/bbb"]
+
+    def test_expired_entries_purged_on_open(self, tmp_path):
+        path = str(tmp_path / "metadata_cache.db")
+        stale = MetadataCache(path=path, ttl=-1, negative_ttl=-1)
+        stale.put(["doi:10.1000/old"], HIT)
+        stale.put(["doi:10.1000/miss"], {"enriched": False})
+
+        reopened = MetadataCache(path=path)
+
+        assert reopened._connect().execute("SELECT COUNT(*) FROM enrichment").fetchone()[0] == 0
+
+    def test_negative_result_cached_with_short_ttl(self, cache, monkeypatch):
+        enricher = MetadataEnricher(cache=cache)
+        calls = []
+        monkeypatch.setattr(enricher, "_lookup", lambda doi, title: calls.append(title))
+
+        result = enricher.enrich_paper("Unindexed Paper Title", "", ["Exa Author"], "exa abstract")
+        again = enricher.enrich_paper("Unindexed Paper Title", "", ["Exa Author"], "exa abstract")
+
+        assert result["enriched"] is False and again["authors"] == ["Exa Author"]
+        assert len(calls) == 1
+
+        cache.negative_ttl = -1
+        cache.put(MetadataEnricher._cache_keys(None, "Unindexed Paper Title"), {"enriched": False})
+        enricher.enrich_paper("Unindexed Paper Title", "", [], "")
+
+        assert len(calls) == 2
+
+    def test_transport_failure_not_cached(self, cache, monkeypatch):
+        import requests
+
+        enricher = MetadataEnricher(cache=cache)
+        calls = []
+
+        def flaky_request(session, method, url, **kwargs):
+            calls.append(url)
+            raise requests.ConnectionError("down")
+
+        monkeypatch.setattr("optoagent.modules.metadata.request_with_retry", flaky_request)
+
+        url = "https://doi.org/10.1000/flaky"
+        result = enricher.enrich_paper("A Paper Behind A Flaky Network", url, ["Exa"], "exa")
+        assert result["enriched"] is False and result["authors"] == ["Exa"]
+        assert cache.get(MetadataEnricher._cache_keys("10.1000/flaky", "")) is None
+
+        # The next run asks again instead of trusting a cached miss
+        seen = len(calls)
+        enricher.enrich_paper("A Paper Behind A Flaky Network", url, ["Exa"], "exa")
+        assert len(calls) > seen
+
+
+class _FakeBatchResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class TestBatchEnrichment:
+    def test_dois_resolved_in_one_batch_request(self, cache, monkeypatch):
+        from optoagent.models import Paper
+
+        enricher = MetadataEnricher(cache=cache)
+        posts = []
+
+        def fake_request(method, url, params=None, json=None, timeout=None):
+            assert method == "POST" and url.endswith("/paper/batch")
+            posts.append(json["ids"])
+            return _FakeBatchResponse([
+                {"authors": [{"name": "Alice"}], "abstract": "found"} if i == "DOI:10.1000/hit" else None
+                for i in json["ids"]
+            ])
+
+        fallbacks = []
+        monkeypatch.setattr(enricher._session, "request", fake_request)
+        monkeypatch.setattr(enricher, "_lookup_crossref_doi", lambda doi: fallbacks.append(doi))
+        monkeypatch.setattr(enricher, "_search_semantic_scholar_title", lambda title: fallbacks.append(title))
+
+        papers = [
+            Paper(title="Hit Paper", authors=[], abstract="", url="https://x.org/doi/10.1000/hit"),
+            Paper(title="Miss Paper", authors=[], abstract="", url="https://x.org/doi/10.1000/miss"),
+            Paper(title="No DOI Paper", authors=["Exa"], abstract="exa", url="https://x.org/page"),
+        ]
+        results = enricher.enrich_papers(papers)
+
+        assert posts == [["DOI:10.1000/hit", "DOI:10.1000/miss"]]
+        assert results[0]["authors"] == ["Alice"] and results[0]["enriched"]
+        # CrossRef for the DOI miss, then title search for everything still missing
+        assert fallbacks == ["10.1000/miss", "Miss Paper", "No DOI Paper"]
+        assert results[2] == {"authors": ["Exa"], "abstract": "exa", "enriched": False, "source": "exa_original"}
+
+        # Second pass is answered entirely from the cache
+        enricher.enrich_papers(papers)
+        assert len(posts) == 1 and len(fallbacks) == 3
+
+    def test_batch_failures_not_cached(self, cache, monkeypatch):
+        from optoagent.models import Paper
+        from optoagent.modules.metadata import _FAILED
+
+        enricher = MetadataEnricher(cache=cache)
+        monkeypatch.setattr(enricher, "_lookup_semantic_scholar_batch", lambda dois: dict.fromkeys(dois, _FAILED))
+        monkeypatch.setattr(enricher, "_lookup_crossref_doi", lambda doi: None)
+        monkeypatch.setattr(enricher, "_search_semantic_scholar_title", lambda title: None)
+
+        papers = [
+            Paper(title="Rate Limited Paper", authors=[], abstract="", url="https://x.org/doi/10.1000/a"),
+            Paper(title="Unknown Paper", authors=[], abstract="", url="https://x.org/page"),
+        ]
+        results = enricher.enrich_papers(papers)
+
+        assert not results[0]["enriched"] and not results[1]["enriched"]
+        assert cache.get(MetadataEnricher._cache_keys("10.1000/a", "")) is None
+        assert cache.get(MetadataEnricher._cache_keys(None, "Unknown Paper")) == {"enriched": False}
+
+    def test_batch_matches_sequential_results(self, tmp_path, monkeypatch):
+        import time
+
+        from optoagent.models import Paper
+
+        s2_doi = {"10.1000/a": {"authors": ["S2"], "abstract": "s2", "enriched": True, "source": "semantic_scholar_doi"}}
+        crossref = {"10.1000/b": {"authors": ["CR"], "abstract": "cr", "enriched": True, "source": "crossref_doi"}}
+        titles = {"Title C": {"authors": ["T"], "abstract": "t", "enriched": True, "source": "semantic_scholar_title"}}
+
+        def make_enricher(name):
+            enricher = MetadataEnricher(cache=MetadataCache(path=str(tmp_path / f"{name}.db")), crossref_concurrency=4)
+            monkeypatch.setattr(enricher, "_lookup_semantic_scholar_doi", lambda doi: s2_doi.get(doi))
+            monkeypatch.setattr(enricher, "_lookup_semantic_scholar_batch", lambda dois: {d: s2_doi[d] for d in dois if d in s2_doi})
+            monkeypatch.setattr(enricher, "_lookup_crossref_doi", lambda doi: time.sleep(0.05) or crossref.get(doi))
+            monkeypatch.setattr(enricher, "_search_semantic_scholar_title", lambda title: titles.get(title))
+            return enricher
+
+        papers = [
+            Paper(title=t, authors=["orig"], abstract="orig", url=u)
+            for t, u in [
+                ("Title A", "https://x.org/doi/10.1000/a"),
+                ("Title B", "https://x.org/doi/10.1000/b"),
+                ("Title C", "https://x.org/doi/10.1000/c"),
+                ("Title D", "https://x.org/page"),
+                ("Title E", "https://x.org/doi/10.1000/e"),
+            ]
+        ]
+
+        sequential = make_enricher("seq")
+        expected = [sequential.enrich_paper(p.title, p.url, p.authors, p.abstract) for p in papers]
+
+        start = time.monotonic()
+        batched = make_enricher("batch").enrich_papers(papers)
+
+        assert batched == expected
+        # Three CrossRef lookups (b, c, e) overlap instead of running back to back
+        assert time.monotonic() - start < 0.15
@@ -0,0 +1,60 @@
+"""
+Tests for the ONNX all-MiniLM-L6-v2 embedder (model and tokenizer stubbed).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from optoagent.modules.onnx_embedder import MiniLMEmbedder
+
+
+class _FakeTokenizer:
+    """One token per word, padded to four positions."""
+
+    def encode_batch(self, texts):
+        encoded = []
+        for text in texts:
+            ids = [len(word) for word in text.split()][:4]
+            pad = 4 - len(ids)
+            encoded.append(SimpleNamespace(ids=ids + [0] * pad, attention_mask=[1] * len(ids) + [0] * pad))
+        return encoded
+
+
+class _FakeSession:
+    """Hidden state of each token is (id, 1); padding positions get junk."""
+
+    def __init__(self):
+        self.batches = []
+
+    def run(self, outputs, feed):
+        ids = feed["input_ids"]
+        self.batches.append(len(ids))
+        hidden = np.stack([ids, np.ones_like(ids)], axis=-1).astype(np.float32)
+        hidden[feed["attention_mask"] == 0] = 100.0
+        return [hidden]
+
+
+def _embedder():
+    embedder = MiniLMEmbedder(model_dir="/nonexistent")
+    embedder._tokenizer = _FakeTokenizer()
+    embedder._session = _FakeSession()
+    return embedder
+
+
+class TestMiniLMEmbedder:
+    def test_mean_pools_real_tokens_and_normalizes(self):
+        vectors = _embedder()(["ab abcd", "abc"])
+
+        # Means (3, 1) and (3, 1): padding is ignored
+        expected = np.array([3.0, 1.0]) / np.sqrt(10.0)
+        for vec in vectors:
+            assert vec.dtype == np.float32
+            np.testing.assert_allclose(vec, expected, rtol=1e-6)
+
+    def test_batches_inputs(self):
+        embedder = _embedder()
+        vectors = embedder([f"text {i}" for i in range(70)])
+
+        assert len(vectors) == 70
+        assert embedder._session.batches == [32, 32, 6]
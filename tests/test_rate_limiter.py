@@ -0,0 +1,141 @@
+"""
+Tests for the token-bucket rate limiter.
+"""
+
+import time
+
+import requests
+
+from optoagent.config import RATE_LIMIT_BACKOFF_MAX
+from optoagent.modules.rate_limiter import TokenBucket, request_with_retry
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity_without_waiting(self):
+        bucket = TokenBucket(rate=1, capacity=3)
+
+        assert sum(bucket.acquire() for _ in range(3)) == 0
+
+    def test_waits_when_empty(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        bucket.acquire()
+
+        start = time.monotonic()
+        bucket.acquire()
+
+        assert time.monotonic() - start >= 0.04
+
+    def test_zero_rate_disables_limiting(self):
+        bucket = TokenBucket(rate=0)
+
+        assert all(bucket.acquire() == 0 for _ in range(100))
+
+    def test_throttle_pauses_callers(self):
+        bucket = TokenBucket(rate=100, capacity=10)
+        bucket.throttle(0.1)
+
+        start = time.monotonic()
+        bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
+        assert bucket.rate == 50
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _ScriptedSession:
+    """Returns the scripted responses (or raises the scripted errors) in order."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestRequestWithRetry:
+    def test_retries_429_honouring_retry_after(self):
+        session = _ScriptedSession(_Response(429, {"Retry-After": "0.05"}), _Response(200))
+        bucket = TokenBucket(rate=0)
+
+        start = time.monotonic()
+        resp = request_with_retry(session, "GET", "https://api.example.org/x", bucket=bucket, backoff_base=0)
+
+        assert resp.status_code == 200
+        assert session.calls == 2
+        assert time.monotonic() - start >= 0.05
+
+    def test_retries_server_errors_and_connection_errors(self):
+        session = _ScriptedSession(requests.ConnectionError("reset"), _Response(503), _Response(200))
+
+        resp = request_with_retry(
+            session, "GET", "https://api.example.org/x", bucket=TokenBucket(rate=0), backoff_base=0.001
+        )
+
+        assert resp.status_code == 200
+        assert session.calls == 3
+
+    def test_returns_last_response_when_retries_exhausted(self):
+        session = _ScriptedSession(_Response(503), _Response(503))
+
+        resp = request_with_retry(
+            session, "GET", "https://api.example.org/x", bucket=TokenBucket(rate=0), max_retries=1, backoff_base=0.001
+        )
+
+        assert resp.status_code == 503
+        assert session.calls == 2
+
+    def test_client_errors_are_not_retried(self):
+        session = _ScriptedSession(_Response(404))
+
+        resp = request_with_retry(session, "GET", "https://api.example.org/x", bucket=TokenBucket(rate=0))
+
+        assert resp.status_code == 404
+        assert session.calls == 1
+
+    def test_long_retry_after_is_not_waited_out(self):
+        session = _ScriptedSession(_Response(429, {"Retry-After": "3600"}), _Response(200))
+        bucket = TokenBucket(rate=0)
+
+        start = time.monotonic()
+        resp = request_with_retry(session, "GET", "https://api.example.org/x", bucket=bucket)
+
+        assert resp.status_code == 429
+        assert session.calls == 1
+        assert time.monotonic() - start < 1
+        assert bucket._paused_until - time.monotonic() <= RATE_LIMIT_BACKOFF_MAX
+
+    def test_non_idempotent_requests_not_repeated_once_sent(self):
+        for outcome in (_Response(503), requests.ReadTimeout("slow"), requests.ConnectionError("reset")):
+            session = _ScriptedSession(outcome, _Response(200))
+            try:
+                resp = request_with_retry(
+                    session, "POST", "https://api.example.org/send", bucket=TokenBucket(rate=0),
+                    backoff_base=0.001, idempotent=False,
+                )
+                assert resp.status_code == 503
+            except requests.RequestException:
+                pass
+            assert session.calls == 1
+
+    def test_non_idempotent_retried_on_429_and_connect_errors(self):
+        session = _ScriptedSession(
+            _Response(429, {"Retry-After": "0"}), requests.ConnectTimeout("no route"), _Response(200)
+        )
+
+        resp = request_with_retry(
+            session, "POST", "https://api.example.org/send", bucket=TokenBucket(rate=0),
+            backoff_base=0.001, idempotent=False,
+        )
+
+        assert resp.status_code == 200
+        assert session.calls == 3
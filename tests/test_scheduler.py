@@ -0,0 +1,67 @@
+"""
+Tests for the in-process scheduler cycle (fake service).
+"""
+
+import threading
+import time
+
+from optoagent.scheduler import FAILED, OK, SKIPPED, TIMEOUT, CycleRunner
+
+
+class _FakeService:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.release = threading.Event()
+
+    def monitor_sources(self, chat_id=None):
+        self.calls.append(("monitor_sources", time.monotonic()))
+        if self.fail:
+            raise RuntimeError("boom")
+        time.sleep(self.delay)
+        return []
+
+    def run_cycle(self, query=None, limit=5, chat_id=None):
+        self.calls.append(("run_cycle", time.monotonic()))
+        self.release.wait(5)
+        return []
+
+
+class TestCycleRunner:
+    def test_jobs_run_concurrently(self):
+        service = _FakeService(delay=0.3)
+        service.release.set()
+        runner = CycleRunner(service=service, query="q", timeout=5)
+
+        start = time.monotonic()
+        assert runner.run_once() == {"monitor_sources": OK, "run_cycle": OK}
+
+        # run_cycle starts without waiting for monitor_sources to finish
+        assert time.monotonic() - start < 0.6
+        started = dict(service.calls)
+        assert abs(started["run_cycle"] - started["monitor_sources"]) < 0.2
+
+    def test_timeout_then_overlap_skipped(self):
+        service = _FakeService()
+        runner = CycleRunner(service=service, query="q", timeout=0.2)
+
+        assert runner.run_once() == {"monitor_sources": OK, "run_cycle": TIMEOUT}
+        assert runner.run_once() == {"monitor_sources": OK, "run_cycle": SKIPPED}
+
+        service.release.set()
+        time.sleep(0.1)
+        assert runner.run_once()["run_cycle"] == OK
+        assert [name for name, _ in service.calls].count("run_cycle") == 2
+
+    def test_failure_is_isolated(self):
+        service = _FakeService(fail=True)
+        service.release.set()
+        runner = CycleRunner(service=service, query="q", timeout=5)
+
+        assert runner.run_once() == {"monitor_sources": FAILED, "run_cycle": OK}
+
+    def test_no_query_only_monitors(self):
+        runner = CycleRunner(service=_FakeService(), query="", timeout=5)
+
+        assert runner.run_once() == {"monitor_sources": OK}
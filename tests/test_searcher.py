@@ -18,3 +18,27 @@ class TestPaperSearcher:
         papers = searcher.search_active("quantum dots", limit=1)
 
         assert "quantum dots" in papers[0].title
+
+    def test_research_groups_run_concurrently(self, monkeypatch):
+        import time
+
+        from optoagent.models import Paper
+
+        searcher = PaperSearcher(exa_api_key="dummy", max_concurrency=4, rate_limit=0)
+
+        def fake_search(query, limit, academic_only=True):
+            time.sleep(0.2 if query == "slow" else 0.05)
+            return [Paper(title=f"Result for {query}", authors=[], abstract="", url=f"https://x.org/{query}")]
+
+        monkeypatch.setattr(searcher, "_search_exa", fake_search)
+        groups = [{"name": "Slow", "query": "slow"}] + [{"name": f"G{i}", "query": f"q{i}"} for i in range(3)]
+
+        start = time.monotonic()
+        results = list(searcher.iter_research_groups(groups))
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.2 + 3 * 0.05
+        # Streamed in completion order: the slow group arrives last
+        assert results[-1][0] == "Slow"
+        assert results[-1][1][0].title == "[Slow] Result for slow"
+        assert len(results) == 4
@@ -0,0 +1,130 @@
+"""
+Tests for the Feishu webhook server (Flask test client, fake service).
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from optoagent import server
+
+
+def _message_event(text, chat_id="oc_test", event_id=None, message_id=None):
+    return {
+        "header": {"event_type": "im.message.receive_v1", "event_id": event_id},
+        "event": {
+            "message": {
+                "content": json.dumps({"text": text}),
+                "message_type": "text",
+                "chat_id": chat_id,
+                "message_id": message_id,
+            }
+        },
+    }
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class _FakeService:
+    def __init__(self):
+        self.runs = []
+
+    def run_cycle(self, query, limit=5, chat_id=None):
+        self.runs.append((query, limit, chat_id))
+        return []
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    sent = []
+    monkeypatch.setattr(server.notifier, "send_text", lambda text, receive_id=None: sent.append(text))
+    return sent
+
+
+@pytest.fixture
+def client(monkeypatch, replies):
+    from optoagent.jobs import JobQueue
+
+    monkeypatch.setattr(server, "_service", _FakeService())
+    monkeypatch.setattr(server, "jobs", JobQueue(server._run_search, workers=1, max_pending=5))
+    return server.app.test_client()
+
+
+class TestWebhook:
+    def test_challenge(self, client):
+        resp = client.post("/feishu_webhook", json={"challenge": "abc"})
+
+        assert resp.get_json() == {"challenge": "abc"}
+
+    def test_search_runs_in_process(self, client):
+        resp = client.post("/feishu_webhook", json=_message_event("@bot search perovskite"))
+
+        assert resp.get_json() == {"status": "ok"}
+        assert _wait_for(lambda: server._service.runs)
+        assert server._service.runs == [("perovskite", 5, "oc_test")]
+
+    def test_non_search_message_ignored(self, client):
+        client.post("/feishu_webhook", json=_message_event("hello"))
+
+        assert server.jobs.join(timeout=2)
+        assert server._service.runs == []
+
+    def test_redelivered_event_runs_once(self, client, replies):
+        event = _message_event("search metasurface", event_id="ev_1", message_id="om_1")
+        client.post("/feishu_webhook", json=event)
+        client.post("/feishu_webhook", json=event)
+
+        assert server.jobs.join(timeout=2)
+        assert server._service.runs == [("metasurface", 5, "oc_test")]
+        assert _wait_for(lambda: replies)
+        assert len(replies) == 1
+
+
+class _SlowService(_FakeService):
+    def run_cycle(self, query, limit=5, chat_id=None):
+        time.sleep(0.5)
+        return super().run_cycle(query, limit, chat_id)
+
+
+class TestProductionServer:
+    def test_acks_within_deadline_under_load(self, monkeypatch):
+        pytest.importorskip("waitress")
+        import requests
+        from concurrent.futures import ThreadPoolExecutor
+
+        from optoagent.jobs import JobQueue
+
+        # Slow Feishu replies and slow searches must not delay the ack
+        monkeypatch.setattr(server.notifier, "send_text", lambda text, receive_id=None: time.sleep(0.5))
+        monkeypatch.setattr(server, "_service", _SlowService())
+        monkeypatch.setattr(server, "jobs", JobQueue(server._run_search, workers=2, max_pending=5))
+
+        httpd = server.create_production_server(host="127.0.0.1", port=0, threads=8)
+        thread = threading.Thread(target=httpd.run, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{httpd.effective_port}/feishu_webhook"
+
+        def post(i):
+            start = time.perf_counter()
+            resp = requests.post(url, json=_message_event(f"search load {i}", event_id=f"ev_{i}"), timeout=10)
+            return resp.status_code, time.perf_counter() - start
+
+        try:
+            with ThreadPoolExecutor(max_workers=20) as pool:
+                results = list(pool.map(post, range(60)))
+        finally:
+            # Close from inside the server loop so select() never sees a closed socket
+            httpd.trigger.pull_trigger(httpd.close)
+            thread.join(timeout=5)
+            httpd.task_dispatcher.shutdown()
+            server.jobs.join(timeout=10)
+
+        assert all(status == 200 for status, _ in results)
+        assert max(latency for _, latency in results) < 3.0
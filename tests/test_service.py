@@ -0,0 +1,197 @@
+"""
+Tests for the AgentService pipeline (fake components, real Storage).
+"""
+
+import pytest
+
+from optoagent.models import Idea, Paper
+from optoagent.modules.storage import Storage
+from optoagent.service import AgentService
+
+
+class _FakeSearcher:
+    def __init__(self, papers):
+        self.papers = papers
+        self.queries = []
+
+    def search_active(self, query, limit=5):
+        self.queries.append((query, limit))
+        return list(self.papers)
+
+    def monitor_sources(self):
+        return list(self.papers)
+
+    def commit_feed_state(self):
+        self.feed_state = "committed"
+
+    def discard_feed_state(self):
+        self.feed_state = "discarded"
+
+
+class _FakeSummarizer:
+    def summarize_many(self, papers):
+        return [f"Summary of {p.title}" for p in papers]
+
+
+class _FakeNotifier:
+    def __init__(self):
+        self.papers = []
+        self.ideas = []
+
+    def notify_new_paper(self, paper, receive_id=None):
+        self.papers.append((paper.title, receive_id))
+
+    def notify_new_idea(self, idea, receive_id=None):
+        self.ideas.append((idea.title, receive_id))
+
+
+class _FakeVectorStore:
+    def __init__(self):
+        self.queries = []
+
+    def query_similar_context(self, query, n_results=3):
+        self.queries.append(query)
+        return "context"
+
+    def index_papers(self, storage):
+        return 0
+
+    def related_papers(self, query, n_results=5, exclude=()):
+        return []
+
+
+class _FakeIdeaGenerator:
+    def __init__(self):
+        self.calls = []
+        self.related = []
+
+    def generate_idea(self, papers, experiments, context="", related_papers=None):
+        self.calls.append(([p.title for p in papers], context))
+        self.related.append([p.title for p in related_papers or []])
+        return Idea(title="Idea", description="d", reasoning="r", source_papers=[p.title for p in papers])
+
+
+@pytest.fixture
+def make_service(tmp_data_dir):
+    def _make(papers):
+        return AgentService(
+            storage=Storage(data_dir=tmp_data_dir),
+            searcher=_FakeSearcher(papers),
+            summarizer=_FakeSummarizer(),
+            vector_store=_FakeVectorStore(),
+            notifier=_FakeNotifier(),
+            idea_generator=_FakeIdeaGenerator(),
+        )
+    return _make
+
+
+class TestAgentService:
+    def test_run_cycle_stores_notifies_and_generates_idea(self, make_service, sample_paper):
+        service = make_service([sample_paper])
+
+        new_papers = service.run_cycle("quantum dots", limit=3, chat_id="oc_1")
+
+        assert [p.summary for p in new_papers] == [f"Summary of {sample_paper.title}"]
+        assert service.searcher.queries == [("quantum dots", 3)]
+        assert service.storage.count_papers() == 1
+        assert service.notifier.papers == [(sample_paper.title, "oc_1")]
+        assert service.idea_generator.calls == [([sample_paper.title], "context")]
+        assert len(service.storage.get_ideas()) == 1
+
+    def test_context_covers_all_new_papers_in_one_query(self, make_service, sample_paper):
+        other = Paper(title="Perovskite LEDs", authors=[], abstract="", url="https://example.com/p2")
+        service = make_service([sample_paper, other])
+
+        service.run_cycle("q")
+
+        assert len(service.vector_store.queries) == 1
+        queries = service.vector_store.queries[0]
+        assert [q.split(" Summary of")[0] for q in queries] == [sample_paper.title, other.title]
+
+    def test_repeat_run_skips_known_papers(self, make_service, sample_paper):
+        service = make_service([sample_paper])
+        service.active_search("q")
+
+        assert service.active_search("q") == []
+        assert len(service.notifier.papers) == 1
+
+    def test_monitor_sources_without_new_papers_skips_idea(self, make_service):
+        service = make_service([])
+
+        assert service.monitor_sources() == []
+        assert service.idea_generator.calls == []
+
+    def test_feed_state_committed_only_after_papers_are_stored(self, make_service, sample_paper):
+        service = make_service([sample_paper])
+        service.monitor_sources()
+        assert service.searcher.feed_state == "committed"
+
+        failing = make_service([Paper(title="New", authors=[], abstract="", url="https://example.com/n")])
+        failing.summarizer.summarize_many = lambda papers: 1 / 0
+        with pytest.raises(ZeroDivisionError):
+            failing.monitor_sources()
+        assert failing.searcher.feed_state == "discarded"
+
+    def test_repeated_run_without_new_papers_generates_fresh_idea(self, make_service, sample_paper):
+        from types import SimpleNamespace
+
+        from optoagent.modules.idea_generator import IdeaGenerator
+
+        prompts = []
+
+        def create(model, messages):
+            prompts.append(messages[-1]["content"])
+            content = f"TITLE: Idea {len(prompts)}\nDESCRIPTION: d\nREASONING: r\nSOURCE_PAPERS: p"
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+        service = make_service([sample_paper])
+        service.active_search("q")
+        service.idea_generator = IdeaGenerator()
+        service.idea_generator.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        service.generate_idea([])
+        service.generate_idea([])
+
+        assert prompts[0] == prompts[1]
+        assert [i.title for i in service.storage.get_ideas()] == ["Idea 1", "Idea 2"]
+
+
+class TestRelatedPapers:
+    @pytest.fixture
+    def service(self, tmp_data_dir, embedding_function):
+        from optoagent.modules.vector_store import VectorStore
+
+        def _make(papers):
+            return AgentService(
+                storage=Storage(data_dir=tmp_data_dir),
+                searcher=_FakeSearcher(papers),
+                summarizer=_FakeSummarizer(),
+                vector_store=VectorStore(
+                    data_dir=tmp_data_dir, embedding_function=embedding_function, backend="numpy"
+                ),
+                notifier=_FakeNotifier(),
+                idea_generator=_FakeIdeaGenerator(),
+            )
+        return _make
+
+    def test_new_papers_are_indexed_and_searchable(self, service, sample_paper):
+        svc = service([sample_paper])
+        svc.active_search("q")
+
+        related = svc.related_papers("quantum dot spectroscopy", limit=1)
+
+        assert [p.title for p in related] == [sample_paper.title]
+        assert svc.vector_store.index_papers(svc.storage) == 0
+
+    def test_idea_draws_on_related_older_papers(self, service, sample_paper):
+        older = [
+            Paper(title="Quantum dot spectrometer arrays", authors=[], abstract="", url="https://example.com/o1"),
+            Paper(title="Thermal ring resonator tuning", authors=[], abstract="", url="https://example.com/o2"),
+        ]
+        service(older).active_search("q")
+
+        svc = service([sample_paper])
+        svc.run_cycle("q")
+
+        assert svc.idea_generator.related[-1][0] == "Quantum dot spectrometer arrays"
+        assert sample_paper.title not in svc.idea_generator.related[-1]
@@ -59,6 +59,25 @@ class TestStorage:
         assert len(ideas) == 1
         assert ideas[0].title == sample_idea.title
 
+    def test_concurrent_add_idea(self, tmp_data_dir, sample_idea):
+        import threading
+        from dataclasses import replace
+
+        storage = Storage(data_dir=tmp_data_dir)
+
+        def worker(n):
+            for i in range(50):
+                storage.add_idea(replace(sample_idea, title=f"Idea {n}-{i}"))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(storage.get_ideas()) == 100
+        assert not os.path.exists(storage.ideas_file + ".tmp")
+
     def test_empty_storage(self, tmp_data_dir):
         storage = Storage(data_dir=tmp_data_dir)
 
@@ -66,11 +85,89 @@ class TestStorage:
         assert storage.get_experiments() == []
         assert storage.get_ideas() == []
 
-    def test_corrupted_json(self, tmp_data_dir):
-        storage = Storage(data_dir=tmp_data_dir)
-        # Write invalid JSON
+    def test_corrupted_legacy_json(self, tmp_data_dir):
+        # Write invalid JSON where the legacy paper store used to live
         os.makedirs(tmp_data_dir, exist_ok=True)
-        with open(storage.papers_file, "w") as f:
+        with open(os.path.join(tmp_data_dir, "papers.json"), "w") as f:
             f.write("{invalid json")
 
+        storage = Storage(data_dir=tmp_data_dir)
+
+        assert storage.get_papers() == []
+        assert storage.migrate_legacy_papers() == 0
+
+    def test_paper_dedup_by_doi_and_url(self, tmp_data_dir):
+        from optoagent.models import Paper
+
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_paper(Paper(
+            title="Original Title",
+            authors=["Alice"],
+            abstract="",
+            url="https://www.nature.com/articles/s41566-024-01234-5",
+        ))
+        # Same DOI, different URL form and title
+        storage.add_paper(Paper(
+            title="Renamed Title",
+            authors=["Alice"],
+            abstract="",
+            url="https://doi.org/10.1038/s41566-024-01234-5",
+        ))
+        # Same URL with tracking parameters
+        storage.add_paper(Paper(
+            title="Another Title",
+            authors=["Alice"],
+            abstract="",
+            url="http://nature.com/articles/s41566-024-01234-5/?utm_source=rss",
+        ))
+
+        assert storage.count_papers() == 1
+
+    def test_migrate_legacy_json(self, tmp_data_dir, sample_paper):
+        from dataclasses import asdict
+
+        os.makedirs(tmp_data_dir, exist_ok=True)
+        legacy = [asdict(sample_paper), asdict(sample_paper)]
+        with open(os.path.join(tmp_data_dir, "papers.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        storage = Storage(data_dir=tmp_data_dir)
+        papers = storage.get_papers()
+
+        assert len(papers) == 1
+        assert papers[0].title == sample_paper.title
+
+        # Re-opening does not import the legacy file again
+        storage.close()
+        assert Storage(data_dir=tmp_data_dir).count_papers() == 1
+
+    def test_skip_legacy_migration(self, tmp_data_dir, sample_paper):
+        from dataclasses import asdict
+
+        os.makedirs(tmp_data_dir, exist_ok=True)
+        with open(os.path.join(tmp_data_dir, "papers.json"), "w", encoding="utf-8") as f:
+            json.dump([asdict(sample_paper)], f)
+
+        storage = Storage(data_dir=tmp_data_dir, migrate_legacy=False)
+
         assert storage.get_papers() == []
+        assert storage.migrate_legacy_papers() == 1
+
+    def test_filter_new_and_add_papers(self, tmp_data_dir, sample_paper):
+        from optoagent.models import Paper
+
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_paper(sample_paper)
+
+        fresh = Paper(title="Fresh Paper", authors=["Carol"], abstract="", url="https://example.com/fresh")
+        batch = [
+            sample_paper,
+            fresh,
+            Paper(title="FRESH PAPER", authors=["Carol"], abstract="", url="https://example.com/other"),
+        ]
+        new = storage.filter_new(batch)
+
+        assert [p.title for p in new] == ["Fresh Paper"]
+        assert storage.add_papers(new) == new
+        assert storage.add_papers(new) == []
+        assert storage.count_papers() == 2
@@ -0,0 +1,98 @@
+"""
+Tests for PaperSummarizer (fake LLM client, no network).
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from optoagent.models import Paper
+from optoagent.modules.llm_cache import LLMCache
+from optoagent.modules.summarizer import PaperSummarizer
+
+
+class _FakeCompletions:
+    def __init__(self, delay: float = 0.05, fail_titles=()):
+        self.delay = delay
+        self.fail_titles = set(fail_titles)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, messages):
+        prompt = messages[-1]["content"]
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            title = prompt.split("Title: ", 1)[1].split("\n", 1)[0]
+            if title in self.fail_titles:
+                raise RuntimeError("upstream error")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"Summary of {title}"))])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def llm_cache(tmp_path):
+    return LLMCache(path=str(tmp_path / "llm_cache.db"))
+
+
+def _summarizer(completions, max_concurrency, cache):
+    summarizer = PaperSummarizer(api_key=None, max_concurrency=max_concurrency, cache=cache)
+    summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return summarizer
+
+
+def _papers(n):
+    return [Paper(title=f"Paper {i}", authors=["A"], abstract="Some abstract text", url=f"https://x.org/{i}") for i in range(n)]
+
+
+class TestSummarizeMany:
+    def test_preserves_order_and_bounds_concurrency(self, llm_cache):
+        completions = _FakeCompletions(delay=0.05)
+        summarizer = _summarizer(completions, max_concurrency=3, cache=llm_cache)
+
+        start = time.monotonic()
+        summaries = summarizer.summarize_many(_papers(9))
+
+        assert summaries == [f"Summary of Paper {i}" for i in range(9)]
+        assert completions.peak == 3
+        assert time.monotonic() - start < 9 * 0.05
+
+    def test_failed_paper_falls_back_to_simulated(self, llm_cache):
+        summarizer = _summarizer(_FakeCompletions(delay=0, fail_titles={"Paper 1"}), max_concurrency=2, cache=llm_cache)
+
+        summaries = summarizer.summarize_many(_papers(3))
+
+        assert summaries[0] == "Summary of Paper 0"
+        assert summaries[1].startswith("[Simulated Summary] Paper 1")
+        assert summaries[2] == "Summary of Paper 2"
+
+
+class TestSummaryCache:
+    def test_same_paper_via_group_search_hits_cache(self, llm_cache):
+        completions = _FakeCompletions(delay=0)
+        summarizer = _summarizer(completions, max_concurrency=1, cache=llm_cache)
+        rss = Paper(title="Fast Spectrometer", authors=["A"], abstract="Some  abstract\ntext", url="https://x.org/1")
+        exa = Paper(title="[Nature Portfolio] fast spectrometer", authors=["A"], abstract="Some abstract text", url="https://y.org/1")
+
+        first = summarizer.summarize(rss)
+        second = summarizer.summarize(exa)
+
+        assert first == second == "Summary of Fast Spectrometer"
+        assert llm_cache.stats()["hits"] == 1
+        assert completions.peak == 1
+
+    def test_failures_are_not_cached(self, llm_cache):
+        summarizer = _summarizer(_FakeCompletions(delay=0, fail_titles={"Paper 0"}), max_concurrency=1, cache=llm_cache)
+        paper = _papers(1)[0]
+
+        summarizer.summarize(paper)
+        summarizer.client.chat.completions.fail_titles.clear()
+
+        assert summarizer.summarize(paper) == "Summary of Paper 0"
@@ -0,0 +1,362 @@
+"""
+Tests for VectorStore on both backends (hashed bag-of-words embeddings).
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from optoagent.modules.index_manifest import IndexManifest
+from optoagent.modules.vector_store import COLLECTION_NAME, VectorStore
+
+
+@pytest.fixture
+def knowledge(tmp_data_dir):
+    kdir = os.path.join(tmp_data_dir, "knowledge")
+    os.makedirs(kdir)
+    with open(os.path.join(kdir, "qd.md"), "w", encoding="utf-8") as f:
+        f.write("Quantum dot spectrometer calibration notes.")
+    with open(os.path.join(kdir, "solar.md"), "w", encoding="utf-8") as f:
+        f.write("Perovskite solar cell stability under humidity.")
+    return kdir
+
+
+@pytest.fixture(params=["chroma", "numpy"])
+def store(request, tmp_data_dir, embedding_function):
+    return VectorStore(data_dir=tmp_data_dir, embedding_function=embedding_function, backend=request.param)
+
+
+class TestVectorStore:
+    def test_query_before_indexing_is_empty(self, store):
+        assert store.query_similar_context("quantum dot") == ""
+
+    def test_index_and_query(self, store, knowledge):
+        store.index_documents()
+
+        context = store.query_similar_context("quantum dot spectrometer", n_results=1)
+
+        assert context.startswith("[Source: qd.md]")
+
+    def test_handles_are_reused(self, store, knowledge):
+        store.index_documents()
+        collection = store._get_collection()
+
+        for _ in range(3):
+            store.query_similar_context("perovskite")
+
+        assert store._get_collection() is collection
+
+    def test_concurrent_first_use_builds_one_collection(self, store, knowledge):
+        handles = []
+        threads = [threading.Thread(target=lambda: handles.append(store._get_collection())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(h) for h in handles}) == 1
+
+
+class TestQueryMany:
+    def test_one_embedding_call_for_all_queries(self, store, knowledge, embedding_function):
+        store.index_documents()
+        calls = embedding_function.calls
+
+        hits = store.query_many(["quantum dot spectrometer", "perovskite solar humidity"], n_results=2)
+
+        assert embedding_function.calls - calls == 1
+        assert {h["source"] for h in hits} == {"qd.md", "solar.md"}
+
+    def test_merges_duplicate_hits(self, store, knowledge):
+        store.index_documents()
+
+        hits = store.query_many(["quantum dot", "quantum dot spectrometer"], n_results=5)
+
+        assert len({h["id"] for h in hits}) == len(hits) == 2
+        assert hits[0]["source"] == "qd.md"
+        assert hits[0]["hits"] == 2
+        assert hits[0]["distance"] <= hits[1]["distance"]
+
+    def test_empty_queries(self, store, knowledge):
+        store.index_documents()
+
+        assert store.query_many(["", "  "]) == []
+
+    def test_context_for_several_queries(self, store, knowledge):
+        store.index_documents()
+
+        context = store.query_similar_context(["quantum dot", "perovskite"], n_results=2)
+
+        assert "[Source: qd.md]" in context
+        assert "[Source: solar.md]" in context
+
+
+class TestEmbeddingReuse:
+    def test_queries_and_reindex_hit_the_cache(self, store, knowledge, embedding_function, tmp_data_dir):
+        store.index_documents()
+        store.query_similar_context("quantum dot")
+        calls = embedding_function.calls
+
+        store.query_similar_context("quantum dot")
+        # Building the other backend's index from scratch reuses every cached vector
+        other = "numpy" if store.backend == "chroma" else "chroma"
+        rebuilt = VectorStore(data_dir=tmp_data_dir, embedding_function=embedding_function, backend=other)
+        rebuilt.index_documents()
+
+        assert embedding_function.calls == calls
+        assert rebuilt._get_collection().count() == 2
+
+    def test_cache_key_stable_when_default_model_loads_lazily(self, tmp_data_dir, embedding_function, monkeypatch):
+        from optoagent.modules import vector_store
+
+        class _Default:
+            """Stands in for a default function that names itself "default"."""
+
+            def __call__(self, input):
+                return embedding_function(input)
+
+            def name(self):
+                return "default"
+
+        monkeypatch.setattr(vector_store, "get_default_embedding_function", _Default)
+        store = VectorStore(data_dir=tmp_data_dir, backend="numpy")
+
+        store._embed(["a", "b"])
+        store._embed(["a", "b"])
+
+        assert embedding_function.texts == 2
+
+    def test_numpy_backend_does_not_need_chromadb_client(self, tmp_data_dir, knowledge, embedding_function):
+        store = VectorStore(data_dir=tmp_data_dir, embedding_function=embedding_function, backend="numpy")
+        store.index_documents()
+
+        assert store._client is None
+        assert store.query_similar_context("perovskite", n_results=1).startswith("[Source: solar.md]")
+
+    def test_numpy_backend_never_imports_chromadb(self, tmp_data_dir, knowledge):
+        # The default embedder itself, with only the ONNX inference stubbed out
+        script = (
+            "import sys\n"
+            "from optoagent.modules.onnx_embedder import MiniLMEmbedder\n"
+            "from optoagent.modules.vector_store import VectorStore\n"
+            "MiniLMEmbedder.__call__ = lambda self, texts: [[float(len(t)), 1.0] for t in texts]\n"
+            f"store = VectorStore(data_dir={tmp_data_dir!r}, backend='numpy')\n"
+            "store.index_documents()\n"
+            "assert store.query_similar_context('perovskite', n_results=1)\n"
+            "assert 'chromadb' not in sys.modules, 'chromadb was imported'\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+
+        assert result.returncode == 0, result.stderr[-2000:]
+
+
+class TestIncrementalIndexing:
+    def test_unchanged_files_are_not_reembedded(self, store, knowledge, embedding_function):
+        store.index_documents()
+        embedded = embedding_function.texts
+
+        store.index_documents()
+
+        assert embedding_function.texts == embedded
+        assert store._get_collection().count() == 2
+
+    def test_touched_file_with_same_content_is_skipped(self, store, knowledge, embedding_function):
+        store.index_documents()
+        embedded = embedding_function.texts
+        path = os.path.join(knowledge, "qd.md")
+        os.utime(path, ns=(1, 1))
+
+        store.index_documents()
+
+        assert embedding_function.texts == embedded
+
+    def test_shrunk_file_drops_stale_chunks(self, store, knowledge):
+        path = os.path.join(knowledge, "long.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("x" * 2500)
+        store.index_documents()
+        assert store._get_collection().count() == 5
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("y" * 500)
+        store.index_documents()
+
+        assert store._get_collection().count() == 3
+
+    def test_deleted_file_is_removed(self, store, knowledge):
+        store.index_documents()
+        os.remove(os.path.join(knowledge, "solar.md"))
+
+        store.index_documents()
+
+        assert store._get_collection().count() == 1
+        assert store.query_similar_context("perovskite", n_results=3).count("[Source:") == 1
+
+    def test_edit_reembeds_only_changed_chunks(self, store, knowledge, embedding_function):
+        path = os.path.join(knowledge, "sections.md")
+        sections = [f"# Section {i}\n" + f"Notes on topic {i}. " * 40 for i in range(4)]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(sections))
+        store.index_documents()
+        count = store._get_collection().count()
+        embedded = embedding_function.texts
+
+        sections[2] += " One more line."
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(sections))
+        store.index_documents()
+
+        assert embedding_function.texts - embedded == 1
+        assert store._get_collection().count() == count
+
+    def test_same_name_in_subfolders_kept_apart(self, store, knowledge):
+        os.makedirs(os.path.join(knowledge, "sub"))
+        with open(os.path.join(knowledge, "sub", "qd.md"), "w", encoding="utf-8") as f:
+            f.write("A different note with the same file name.")
+
+        store.index_documents()
+
+        assert store._get_collection().count() == 3
+
+    def test_chunks_from_an_unversioned_index_are_dropped(self, store, knowledge, embedding_function):
+        # Indexes built before the manifest used "<file>_<n>" chunk IDs
+        store._get_collection().upsert(
+            ids=["qd.md_0"], documents=["Quantum dot spectrometer calibration notes."],
+            metadatas=[{"source": "qd.md"}], embeddings=embedding_function(["old"]),
+        )
+
+        store.index_documents()
+        os.remove(os.path.join(knowledge, "qd.md"))
+        store.index_documents()
+
+        assert store._get_collection().count() == 1
+        assert "qd.md" not in store.query_similar_context("quantum dot spectrometer")
+
+    def test_changed_chunk_settings_rebuild_the_index(self, store, knowledge):
+        with open(os.path.join(knowledge, "long.md"), "w", encoding="utf-8") as f:
+            f.write(" ".join(f"Long note sentence {i}." for i in range(100)))
+        store.index_documents()
+        count = store._get_collection().count()
+
+        store.chunk_size = 300
+        store.chunk_overlap = 30
+        store.index_documents()
+
+        assert store._get_collection().count() > count
+        assert IndexManifest(store.manifest_path).signature["chunk_size"] == 300
+        store.index_documents()
+        assert store._get_collection().count() > count
+
+
+class _FailingCollection:
+    """Wraps a collection and raises on the Nth upsert."""
+
+    def __init__(self, collection, fail_on):
+        self._collection = collection
+        self.fail_on = fail_on
+        self.upserts = []
+
+    def upsert(self, ids, **kwargs):
+        self.upserts.append(list(ids))
+        if len(self.upserts) == self.fail_on:
+            raise RuntimeError("interrupted")
+        return self._collection.upsert(ids=ids, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class TestBatchedIndexing:
+    @pytest.fixture
+    def notes(self, tmp_data_dir):
+        kdir = os.path.join(tmp_data_dir, "knowledge")
+        os.makedirs(kdir)
+        for i in range(5):
+            with open(os.path.join(kdir, f"note{i}.md"), "w", encoding="utf-8") as f:
+                f.write(f"note {i} " * 200)  # two chunks each
+        return kdir
+
+    def test_upserts_in_fixed_size_batches(self, store, notes):
+        store.batch_size = 3
+        wrapper = _FailingCollection(store._get_collection(), fail_on=0)
+        store._collections[COLLECTION_NAME] = wrapper
+
+        store.index_documents()
+
+        assert [len(ids) for ids in wrapper.upserts] == [3, 3, 3, 1]
+        assert store._get_collection().count() == 10
+
+    def test_interrupted_run_resumes(self, store, notes, embedding_function):
+        store.batch_size = 2
+        store.checkpoint_every = 1
+        collection = store._get_collection()
+        store._collections[COLLECTION_NAME] = _FailingCollection(collection, fail_on=3)
+
+        with pytest.raises(RuntimeError):
+            store.index_documents()
+        assert len(IndexManifest(store.manifest_path).paths()) == 2
+
+        store._collections[COLLECTION_NAME] = _FailingCollection(collection, fail_on=0)
+        embedded = embedding_function.texts
+        store.index_documents()
+
+        # Only the three files that were not recorded are written again, and the
+        # batch that failed after embedding comes from the embedding cache
+        assert sum(len(ids) for ids in store._collections[COLLECTION_NAME].upserts) == 6
+        assert embedding_function.texts - embedded == 4
+        assert collection.count() == 10
+
+
+class TestPaperIndex:
+    @pytest.fixture
+    def storage(self, tmp_data_dir):
+        from optoagent.models import Paper
+        from optoagent.modules.storage import Storage
+
+        storage = Storage(data_dir=tmp_data_dir)
+        storage.add_papers([
+            Paper(title="Quantum dot spectrometer", authors=[], abstract="Colloidal dots on a chip.",
+                  url="https://example.com/qd"),
+            Paper(title="Perovskite solar cell stability", authors=[], abstract="Humidity degradation.",
+                  url="https://example.com/pv", summary="Encapsulation doubles lifetime."),
+        ])
+        return storage
+
+    def test_index_and_search(self, store, storage):
+        assert store.index_papers(storage) == 2
+
+        hits = store.related_papers("perovskite encapsulation lifetime", n_results=1)
+
+        assert [h["title"] for h in hits] == ["Perovskite solar cell stability"]
+        assert storage.get_papers_by_ids([hits[0]["id"]])[hits[0]["id"]].url == "https://example.com/pv"
+
+    def test_only_new_papers_are_embedded(self, store, storage, embedding_function):
+        from optoagent.models import Paper
+
+        store.index_papers(storage)
+        embedded = embedding_function.texts
+        assert store.index_papers(storage) == 0
+
+        storage.add_paper(Paper(title="Lithium niobate modulator", authors=[], abstract="", url="https://example.com/ln"))
+        assert store.index_papers(storage) == 1
+        assert embedding_function.texts - embedded == 1
+        assert store.related_papers("lithium niobate", n_results=1)[0]["title"] == "Lithium niobate modulator"
+
+    def test_exclude(self, store, storage):
+        store.index_papers(storage)
+        best = store.related_papers("quantum dot", n_results=1)[0]
+
+        hits = store.related_papers("quantum dot", n_results=1, exclude=[best["id"]])
+
+        assert [h["id"] for h in hits] != [best["id"]]
+        assert len(hits) == 1
+
+    def test_papers_and_notes_are_kept_apart(self, store, storage, knowledge):
+        store.index_documents()
+        store.index_papers(storage)
+
+        assert all(h["source"] for h in store.query_many(["perovskite"], n_results=5))
+        assert len(store.related_papers("perovskite", n_results=5)) == 2